@@ -13,14 +13,23 @@ Lazy Transfer:
 - Actual transfer happens on-demand when peer requests
 - Large files are streamed in chunks (memory efficient)
 """
+import select
+import selectors
 import socket
+import stat
+import struct
+import sys
+import tempfile
 import threading
 import logging
 import time
 import os
 import hashlib
+import hmac
 import uuid
-from typing import Optional, Callable, List, Dict
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Callable, List, Dict, Tuple
 from pathlib import Path
 
 from yank import config
@@ -28,17 +37,24 @@ from yank.common.protocol import (
     MessageType,
     MessageBuilder,
     MessageParser,
+    MAX_MESSAGE_SIZE,
     TransferMetadata,
     ChunkInfo,
-    pack_files,
-    unpack_files
+    collect_files,
+    unpack_files,
+    new_checksum,
+    calculate_checksum_bytes
 )
 from yank.common.discovery import start_discovery, stop_discovery, get_discovery
 from yank.common.pairing import get_pairing_manager, is_paired, get_encryption_key
+from yank.common.crypto import backend_info
 from yank.common.file_registry import FileRegistry, TransferStatus
 from yank.common.chunked_transfer import (
+    ChunkBufferPool,
+    ChunkChecksumCache,
     ChunkedFileReader,
     ChunkedFileWriter,
+    ProgressThrottle,
     ProgressTracker,
     create_file_metadata,
     format_bytes,
@@ -49,6 +65,355 @@ from yank.common.transfer_manager import get_transfer_manager, TransferManager
 logger = logging.getLogger(__name__)
 
 
+def _file_set_hash(file_paths: List[Path]) -> int:
+    """
+    Identify a set of files for duplicate-send detection.
+
+    Hashes (path, size, mtime) per file rather than file contents, so the cost is
+    O(number of files) regardless of how large they are.
+    """
+    entries = []
+    for path in file_paths:
+        st = os.stat(path)
+        entries.append((str(path), st.st_size, st.st_mtime_ns))
+    return hash(tuple(entries))
+
+
+LOOPBACK_HOSTS = ('127.0.0.1', '::1', 'localhost')
+
+
+def _unix_socket_dir() -> Optional[Path]:
+    """
+    Private per-user directory for AF_UNIX sockets.
+
+    $XDG_RUNTIME_DIR/yank where the session provides one, otherwise
+    yank-<uid> in the system temp dir. Either way the directory must be ours
+    and closed to everyone else, so nobody else can plant or swap a socket
+    in it. Returns None (TCP only) if no such directory can be had.
+    """
+    if not hasattr(os, 'getuid'):
+        return None
+    uid = os.getuid()
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        path = Path(runtime_dir) / 'yank'
+    else:
+        path = Path(tempfile.gettempdir()) / f'yank-{uid}'
+
+    try:
+        path.mkdir(mode=0o700, exist_ok=True)
+        st = os.lstat(path)
+        if not stat.S_ISDIR(st.st_mode) or st.st_uid != uid:
+            logger.warning(f"Not using {path} for local sockets: not a directory owned by us")
+            return None
+        if st.st_mode & 0o077:
+            os.chmod(path, 0o700)
+    except OSError as e:
+        logger.debug(f"No private socket directory at {path}: {e}")
+        return None
+    return path
+
+
+def _unix_socket_path(port: int) -> Optional[Path]:
+    """Well-known AF_UNIX socket path for the agent listening on this TCP port"""
+    socket_dir = _unix_socket_dir()
+    if socket_dir is None:
+        return None
+    return socket_dir / f"yank-{port}.sock"
+
+
+def _peer_uid(sock: socket.socket) -> Optional[int]:
+    """Uid of the process at the other end of an AF_UNIX socket, where the OS says"""
+    if not hasattr(socket, 'SO_PEERCRED'):
+        return None
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+    return struct.unpack('3i', creds)[1]
+
+
+def _connect_unix(port: int) -> Optional[socket.socket]:
+    """
+    Connect to a same-host agent over its AF_UNIX socket.
+
+    The socket must be owned by this user, and so must the listening process
+    where SO_PEERCRED can tell. Returns None if AF_UNIX is unavailable, no
+    agent is listening there or it fails those checks, so the caller can
+    fall back to TCP.
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    path = _unix_socket_path(port)
+    if path is None:
+        return None
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return None
+    if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.getuid():
+        logger.warning(f"Ignoring {path}: not a socket owned by us")
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+        peer_uid = _peer_uid(sock)
+    except OSError:
+        sock.close()
+        return None
+    if peer_uid is not None and peer_uid != os.getuid():
+        logger.warning(f"Ignoring {path}: listener runs as uid {peer_uid}")
+        sock.close()
+        return None
+    return sock
+
+
+def _tune_socket(sock: socket.socket):
+    """
+    Apply latency and liveness options to a connected TCP socket.
+
+    Disables Nagle so small control frames (acks, auth, short text) go out
+    immediately, and enables keepalive so a vanished peer is noticed on
+    long-lived connections. The keepalive timing options are per-platform,
+    so each is only set where the constant exists. AF_UNIX sockets are left
+    as they are.
+    """
+    if sock.family not in (socket.AF_INET, socket.AF_INET6):
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        for name, value in (('TCP_KEEPIDLE', 30), ('TCP_KEEPINTVL', 10), ('TCP_KEEPCNT', 3)):
+            if hasattr(socket, name):
+                sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, name), value)
+    except OSError as e:
+        logger.debug(f"Could not tune socket: {e}")
+
+
+def _set_cork(sock: socket.socket, on: bool) -> bool:
+    """
+    Hold back (on) or flush (off) partial frames on a TCP socket.
+
+    Used while replying to several frames that arrived together, so their
+    small replies leave in as few segments as possible. Linux only; returns
+    whether corking was applied.
+    """
+    if not hasattr(socket, 'TCP_CORK') or sock.family not in (socket.AF_INET, socket.AF_INET6):
+        return False
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 1 if on else 0)
+        return True
+    except OSError as e:
+        logger.debug(f"Could not set TCP_CORK: {e}")
+        return False
+
+
+def _size_bulk_socket(sock: socket.socket):
+    """
+    Raise the receive buffer of a socket that will carry file data.
+
+    Applies config.BULK_RECV_BUFFER, if set, before connect() or listen() so
+    the larger window is advertised from the handshake. Only ever grows the buffer: an
+    explicit SO_RCVBUF turns off the kernel's receive autotuning, so it is
+    left alone unless the current size is below the configured floor.
+    """
+    if not config.BULK_RECV_BUFFER:
+        return
+    try:
+        current = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        if current < config.BULK_RECV_BUFFER:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, config.BULK_RECV_BUFFER)
+    except OSError as e:
+        logger.debug(f"Could not size socket buffer: {e}")
+
+
+def _bulk_recv_size(chunk_size: int) -> int:
+    """
+    Receive buffer size for a download loop.
+
+    Reading a whole chunk per recv_into call, rather than BUFFER_SIZE, cuts
+    the syscalls per chunk from chunk_size / BUFFER_SIZE to about one. The
+    chunk size comes from the peer's announcement, so it is capped at the
+    largest frame the parser will accept.
+    """
+    return min(max(config.BUFFER_SIZE, chunk_size), MAX_MESSAGE_SIZE)
+
+
+def _connection_reusable(sock: socket.socket, last_used: float) -> bool:
+    """
+    Check whether an idle authenticated connection can carry another request.
+
+    The peer closes connections that sit idle for 30s, so anything idle for
+    longer than config.PEER_CONNECTION_IDLE is retired first. A socket that
+    is readable while nothing is outstanding means the peer has closed it (or
+    sent something unsolicited); either way it shouldn't be reused.
+    """
+    if time.time() - last_used > config.PEER_CONNECTION_IDLE:
+        return False
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+    except (OSError, ValueError):
+        return False
+    return not readable
+
+
+class _StreamDesync(RuntimeError):
+    """
+    A frame was cut short after its length prefix went out.
+
+    The peer will read whatever is sent next as the rest of that frame, so
+    the connection can't carry anything more - not even an error reply - and
+    has to be closed.
+    """
+
+
+def _sendfile_exact(sock: socket.socket, path: Path, size: int):
+    """
+    Stream exactly size bytes of a file with socket.sendfile.
+
+    Raises _StreamDesync if the file yields a different number of bytes (it
+    changed after its size was announced), since the frame length is fixed.
+    """
+    with open(path, 'rb') as f:
+        sent = sock.sendfile(f, 0, size) if size else 0
+    if sent != size:
+        raise _StreamDesync(f"Sent {sent} of {size} bytes of {path}")
+
+
+CHALLENGE_SIZE = 32
+_RNG_REFILL_SIZE = 4096
+_rng_lock = threading.Lock()
+_rng_buf = bytearray()
+_rng_off = 0
+
+
+def _fresh_challenge() -> bytes:
+    """
+    Return CHALLENGE_SIZE fresh random bytes for an auth challenge.
+
+    Bytes are sliced from a 4 KiB block drawn from os.urandom, so a burst of
+    connections costs one getrandom call per 128 challenges. Each byte is
+    handed out once.
+    """
+    global _rng_off
+    with _rng_lock:
+        if _rng_off + CHALLENGE_SIZE > len(_rng_buf):
+            _rng_buf[:] = os.urandom(_RNG_REFILL_SIZE)
+            _rng_off = 0
+        challenge = bytes(_rng_buf[_rng_off:_rng_off + CHALLENGE_SIZE])
+        _rng_off += CHALLENGE_SIZE
+        return challenge
+
+
+_handshake_tls = threading.local()
+
+
+def _auth_response(challenge: bytes, key: bytes) -> bytes:
+    """
+    Expected AUTH_RESPONSE payload for a challenge: HMAC-SHA256(key, challenge)
+
+    Each thread keeps an HMAC already keyed with the pairing key and copies it
+    per challenge, so the key schedule isn't redone on every handshake.
+    """
+    keyed = getattr(_handshake_tls, 'hmac', None)
+    if keyed is None or _handshake_tls.key != key:
+        keyed = hmac.new(key, digestmod='sha256')
+        _handshake_tls.hmac = keyed
+        _handshake_tls.key = key
+    mac = keyed.copy()
+    mac.update(challenge)
+    return mac.digest()
+
+
+# Handshake frames (auth challenge/response/result, pong) are tiny and unencrypted
+_HANDSHAKE_HEADER = struct.Struct('>IB')  # length, message type
+MAX_HANDSHAKE_SIZE = 1024
+
+
+def _recv_exact(sock: socket.socket, n: int) -> Optional[bytearray]:
+    """Receive exactly n bytes, or None if the connection closes first"""
+    buf = bytearray(n)
+    view = memoryview(buf)
+    received = 0
+    while received < n:
+        count = sock.recv_into(view[received:])
+        if not count:
+            return None
+        received += count
+    return buf
+
+
+def _read_handshake(sock: socket.socket) -> Optional[Tuple[int, bytes]]:
+    """
+    Read exactly one handshake frame from the socket.
+
+    Only that frame's bytes are consumed, so anything the peer pipelined behind
+    it stays in the socket for the connection's main parser.
+
+    Returns (msg_type, payload), or None if the connection closed or the frame
+    is not a plausible handshake frame.
+    """
+    header = _recv_exact(sock, _HANDSHAKE_HEADER.size)
+    if header is None:
+        return None
+
+    length, msg_type = _HANDSHAKE_HEADER.unpack(header)
+    if length < 1 or length > MAX_HANDSHAKE_SIZE:
+        return None
+
+    payload = _recv_exact(sock, length - 1) if length > 1 else b''
+    if payload is None:
+        return None
+
+    return msg_type, bytes(payload)
+
+
+# Most buffers one sendmsg call accepts (IOV_MAX; 1024 on Linux and macOS)
+_IOV_MAX = 1024
+
+
+def _send_frames(sock: socket.socket, *frames: bytes):
+    """
+    Send several frames back to back in as few writes as possible.
+
+    Uses scatter/gather sendmsg (writev) where available so the frames leave in
+    one burst without being concatenated first; falls back to a single joined
+    sendall (Windows has no sendmsg).
+    """
+    if not hasattr(sock, 'sendmsg'):
+        sock.sendall(b''.join(frames))
+        return
+
+    views = [memoryview(f) for f in frames if f]
+    while views:
+        sent = sock.sendmsg(views[:_IOV_MAX])
+        if sent == 0:
+            raise RuntimeError("Socket connection broken")
+        # Drop fully sent frames, trim a partially sent one
+        while views and sent >= len(views[0]):
+            sent -= len(views[0])
+            views.pop(0)
+        if sent:
+            views[0] = views[0][sent:]
+
+
+class _ClientConnection:
+    """
+    An accepted, authenticated connection and its parsing state.
+
+    Kept across the gaps between messages: while idle the connection waits on
+    the server selector instead of holding a worker thread, and it resumes
+    with the same parser and receive buffer when the peer sends again.
+    """
+    __slots__ = ('sock', 'addr', 'key', 'parser', 'recv_buf', 'idle_since')
+
+    def __init__(self, sock: socket.socket, addr: tuple, key: Optional[bytes]):
+        self.sock = sock
+        self.addr = addr
+        self.key = key
+        self.parser = MessageParser(key=key)
+        self.recv_buf = bytearray(config.BUFFER_SIZE)
+        self.idle_since = 0.0
+
+
 class SyncAgent:
     """
     Main sync agent that handles:
@@ -86,16 +451,38 @@ class SyncAgent:
         self.require_pairing = require_pairing
 
         self._server_socket: Optional[socket.socket] = None
+        self._unix_server_socket: Optional[socket.socket] = None  # Same-host fast path
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._wake_r: Optional[socket.socket] = None  # Written to wake _server_loop
+        self._wake_w: Optional[socket.socket] = None
+        self._parked: deque = deque()  # Idle connections for _server_loop to watch
+        self._active_clients: set = set()  # Client sockets a worker is using right now
+        self._active_clients_lock = threading.Lock()
         self._running = False
         self._server_thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
         self._peer_ip: Optional[str] = config.PEER_IP
         self._peer_port: int = port
         self._lock = threading.Lock()
 
+        # Cached authenticated connection to the peer, reused across sends.
+        # _conn_lock serialises request/reply exchanges on it.
+        self._peer_conn: Optional[socket.socket] = None
+        self._peer_parser: Optional[MessageParser] = None
+        self._peer_conn_key: Optional[tuple] = None  # (ip, port, encryption_key)
+        self._peer_conn_used: float = 0
+        self._peer_recv_buf = bytearray(config.BUFFER_SIZE)  # Reply reads, under _conn_lock
+        self._conn_lock = threading.Lock()
+
+        # Idle authenticated connections left by download_single_file, kept for
+        # the next download: (ip, port, key) -> [(socket, parser, last_used)]
+        self._download_conns: Dict[tuple, List[tuple]] = {}
+        self._download_conns_lock = threading.Lock()
+
         # Track last sent to avoid loops
-        self._last_sent_hash: Optional[str] = None
+        self._last_sent_hash: Optional[int] = None
         self._last_sent_time: float = 0
-        self._last_sent_text_hash: Optional[str] = None
+        self._last_sent_text_hash: Optional[int] = None
         self._last_sent_text_time: float = 0
 
         # Pairing manager
@@ -111,6 +498,17 @@ class SyncAgent:
         self._active_writers: Dict[str, Dict[int, ChunkedFileWriter]] = {}  # transfer_id -> {file_index -> writer}
         self._writers_lock = threading.RLock()  # Protects _active_writers access
 
+        # Reusable chunk buffers for serving FILE_REQUESTs, one per server worker
+        self._chunk_pool = ChunkBufferPool(DEFAULT_CHUNK_SIZE, count=config.SERVER_WORKERS)
+        # Chunk checksums of files already served, so re-serving them is pure sendfile
+        self._checksum_cache = ChunkChecksumCache()
+
+        # Checksums of downloaded chunks run on the verify pool so they overlap
+        # the next recv (hashlib releases the GIL). Writes go through a single
+        # thread in arrival order, so in-order chunks reach ChunkedFileWriter
+        # contiguously. Threads start on first use.
+        self._verify_pool, self._write_pool = self._new_chunk_pools()
+
     def _safe_close_socket(self, sock: socket.socket):
         """Safely close a socket, handling any errors"""
         if not sock:
@@ -124,6 +522,14 @@ class SyncAgent:
         except OSError:
             pass
 
+    @staticmethod
+    def _new_chunk_pools() -> Tuple[ThreadPoolExecutor, ThreadPoolExecutor]:
+        """(verify pool, single-thread write pool) for downloaded chunks"""
+        return (
+            ThreadPoolExecutor(max_workers=config.VERIFY_WORKERS, thread_name_prefix='yank-verify'),
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix='yank-write')
+        )
+
     def start(self):
         """Start the sync agent (server + discovery)"""
         if self._running:
@@ -143,6 +549,7 @@ class SyncAgent:
             )
         
         logger.info(f"Sync agent started on port {self.port}")
+        logger.info(f"Encryption backend: {backend_info()}")
     
     def stop(self):
         """Stop the sync agent"""
@@ -151,11 +558,71 @@ class SyncAgent:
         # Stop discovery
         stop_discovery()
         
+        # Wake the accept loop and let it exit before closing its sockets
+        if self._wake_w:
+            try:
+                self._wake_w.send(b'\0')
+            except OSError:
+                pass
+        if self._server_thread:
+            self._server_thread.join(timeout=2)
+
+        # Close idle connections waiting on the selector
+        if self._selector:
+            for key in list(self._selector.get_map().values()):
+                if isinstance(key.data, _ClientConnection):
+                    self._safe_close_socket(key.data.sock)
+        while self._parked:
+            self._safe_close_socket(self._parked.popleft().sock)
+
+        # Unblock workers still reading from or writing to a client. The worker
+        # owns the socket and closes it once its recv/send fails.
+        with self._active_clients_lock:
+            active = list(self._active_clients)
+        for sock in active:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
         # Stop server
         self._safe_close_socket(self._server_socket)
+        if self._unix_server_socket:
+            path = self._unix_server_socket.getsockname()
+            self._safe_close_socket(self._unix_server_socket)
+            self._unix_server_socket = None
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        if self._selector:
+            self._selector.close()
+            self._selector = None
+        for wake in (self._wake_r, self._wake_w):
+            if wake:
+                wake.close()
+        self._wake_r = self._wake_w = None
+
+        with self._conn_lock:
+            self._drop_peer_connection()
+        self._close_download_connections()
         
-        if self._server_thread:
-            self._server_thread.join(timeout=2)
+        if self._executor:
+            # Don't wait for in-flight transfers; drop connections still queued
+            if sys.version_info >= (3, 9):
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            else:
+                self._executor.shutdown(wait=False)
+            self._executor = None
+
+        # Drop queued chunk writes (a download they belong to then fails its
+        # size check and cleans up). The replacement starts no threads until used.
+        for pool in (self._verify_pool, self._write_pool):
+            if sys.version_info >= (3, 9):
+                pool.shutdown(wait=False, cancel_futures=True)
+            else:
+                pool.shutdown(wait=False)
+        self._verify_pool, self._write_pool = self._new_chunk_pools()
         
         logger.info("Sync agent stopped")
     
@@ -164,34 +631,184 @@ class SyncAgent:
         self._server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self._server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self._server_socket.bind(('0.0.0.0', self.port))
+        # Accepted sockets inherit the listener's buffer, and pushed files arrive on them
+        _size_bulk_socket(self._server_socket)
         self._server_socket.listen(5)
-        self._server_socket.settimeout(1.0)  # For clean shutdown
+        self._server_socket.setblocking(False)
+
+        # Same-host peers can skip the TCP stack entirely
+        self._unix_server_socket = self._start_unix_listener()
+
+        # One selector waits on every listener, idle client connections and a
+        # wake-up socket, so the loop sleeps until there is something to do
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+        for listener in (self._server_socket, self._unix_server_socket):
+            if listener:
+                self._selector.register(listener, selectors.EVENT_READ, listener)
+
+        # Fixed pool of connection handlers instead of a thread per connection
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.SERVER_WORKERS,
+            thread_name_prefix='yank-srv'
+        )
         
         self._server_thread = threading.Thread(target=self._server_loop, daemon=True)
         self._server_thread.start()
+
+    def _start_unix_listener(self) -> Optional[socket.socket]:
+        """
+        Listen on an AF_UNIX socket, in this user's private socket directory,
+        next to the TCP listener.
+
+        Returns None where AF_UNIX is unavailable or the socket can't be bound;
+        same-host peers then simply use TCP.
+        """
+        if not hasattr(socket, 'AF_UNIX'):
+            return None
+
+        # Keyed by the port actually bound (self.port may be 0)
+        path = _unix_socket_path(self._server_socket.getsockname()[1])
+        if path is None:
+            return None
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            # A leftover file from a crashed run would make bind fail; the TCP
+            # bind above already proved no live agent owns this port
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            # The directory is already private; the mode is belt and braces
+            listener.bind(str(path))
+            os.chmod(path, 0o600)
+            listener.listen(5)
+            listener.setblocking(False)
+        except OSError as e:
+            logger.debug(f"Not listening on {path}: {e}")
+            listener.close()
+            return None
+
+        return listener
     
     def _server_loop(self):
-        """Main server loop accepting connections"""
+        """Main server loop accepting connections and resuming idle ones"""
         while self._running:
             try:
-                client_socket, addr = self._server_socket.accept()
-                logger.debug(f"Connection from {addr}")
-                
-                # Handle in separate thread
-                handler = threading.Thread(
-                    target=self._handle_client,
-                    args=(client_socket, addr),
-                    daemon=True
-                )
-                handler.start()
-            except socket.timeout:
-                continue
+                events = self._selector.select(self._reap_idle_clients())
             except Exception as e:
                 if self._running:
                     logger.error(f"Server error: {e}")
-    
+                break
+
+            for key, _ in events:
+                data = key.data
+                if data is None:
+                    # Woken by stop() or by a worker parking a connection
+                    self._drain_wakeups()
+                    if not self._running:
+                        return
+                    continue
+
+                if isinstance(data, _ClientConnection):
+                    # An idle connection has data again
+                    self._selector.unregister(data.sock)
+                    if not self._submit_client(self._serve_client, data, True):
+                        return
+                    continue
+
+                try:
+                    client_socket, addr = data.accept()
+                except (BlockingIOError, InterruptedError):
+                    continue  # Another wakeup raced us to it
+                except Exception as e:
+                    if self._running:
+                        logger.error(f"Server error: {e}")
+                    continue
+
+                client_socket.setblocking(True)
+                _tune_socket(client_socket)
+                logger.debug(f"Connection from {addr}")
+
+                if not self._submit_client(self._handle_client, client_socket, addr):
+                    return
+
+    def _submit_client(self, handler: Callable, *args) -> bool:
+        """Hand connection work to the worker pool; False once stop() has shut it down"""
+        try:
+            self._executor.submit(handler, *args)
+            return True
+        except RuntimeError:
+            # Pool already shut down by stop()
+            sock = args[0].sock if isinstance(args[0], _ClientConnection) else args[0]
+            sock.close()
+            return False
+
+    def _drain_wakeups(self):
+        """Consume wake-up bytes and start watching connections parked since"""
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError:
+            return
+
+        while self._parked:
+            conn = self._parked.popleft()
+            try:
+                self._selector.register(conn.sock, selectors.EVENT_READ, conn)
+            except (OSError, ValueError, KeyError):
+                self._safe_close_socket(conn.sock)
+
+    def _reap_idle_clients(self) -> Optional[float]:
+        """
+        Close connections idle for config.SERVER_IDLE_TIMEOUT.
+
+        Returns how long select() may sleep before the next one expires, or
+        None if no connection is idle.
+        """
+        now = time.monotonic()
+        next_expiry = None
+        for key in list(self._selector.get_map().values()):
+            conn = key.data
+            if not isinstance(conn, _ClientConnection):
+                continue
+            expiry = conn.idle_since + config.SERVER_IDLE_TIMEOUT
+            if expiry <= now:
+                logger.debug(f"Idle connection from {conn.addr} timed out")
+                self._selector.unregister(conn.sock)
+                self._safe_close_socket(conn.sock)
+            elif next_expiry is None or expiry < next_expiry:
+                next_expiry = expiry
+        return None if next_expiry is None else next_expiry - now
+
+    def _park_client(self, conn: _ClientConnection) -> bool:
+        """
+        Hand an idle connection to the server loop, freeing this worker.
+
+        Returns False when no server loop is running (e.g. the handler was
+        called directly), in which case the caller keeps reading itself.
+        """
+        wake = self._wake_w
+        if wake is None or not self._running:
+            return False
+        conn.idle_since = time.monotonic()
+        # Untracked before it's queued: the loop may resume it on another worker at once
+        self._untrack_client(conn.sock)
+        self._parked.append(conn)
+        try:
+            wake.send(b'\0')
+        except OSError:
+            # stop() closed the loop; it drains _parked, but may have done so already
+            self._safe_close_socket(conn.sock)
+        return True
+
     def _handle_client(self, client_socket: socket.socket, addr: tuple):
         """Handle incoming connection with authentication"""
+        self._track_client(client_socket)
         encryption_key = self._pairing_manager.get_encryption_key()
 
         # Check if pairing is required
@@ -201,73 +818,114 @@ class SyncAgent:
                 client_socket.sendall(MessageBuilder.build_auth_failure("Device not paired"))
             except:
                 pass
+            self._untrack_client(client_socket)
             client_socket.close()
             return
 
         # Perform challenge-response authentication
         if self.require_pairing and encryption_key:
             if not self._authenticate_client(client_socket, addr, encryption_key):
+                self._untrack_client(client_socket)
                 client_socket.close()
                 return
 
-        # Create parser with encryption key
-        parser = MessageParser(key=encryption_key)
+        self._serve_client(_ClientConnection(client_socket, addr, encryption_key))
+
+    def _serve_client(self, conn: _ClientConnection, readable: bool = False):
+        """
+        Handle messages on a connection until it goes idle or closes.
+
+        A connection with nothing in flight is parked on the server selector
+        rather than left blocking a worker in recv, so idle peers never use
+        up the pool. readable is set when the selector has just reported
+        data, so the socket is read before it can be parked again.
+        """
+        client_socket = conn.sock
+        parser = conn.parser
+        recv_buf = conn.recv_buf
+        recv_view = memoryview(recv_buf)
+        parked = False
+        self._track_client(client_socket)
 
         try:
-            client_socket.settimeout(30.0)
+            client_socket.settimeout(config.SERVER_IDLE_TIMEOUT)
 
             while True:
-                data = client_socket.recv(config.BUFFER_SIZE)
-                if not data:
-                    break
-
-                parser.feed(data)
+                # The first frame of a read is answered right away. If more were
+                # pipelined behind it, their replies are corked and flushed together.
+                handled = 0
+                corked = False
+                try:
+                    while True:
+                        result = parser.parse_one()
+                        if result is None:
+                            break
 
-                while True:
-                    result = parser.parse_one()
-                    if result is None:
-                        break
+                        if handled == 1:
+                            corked = _set_cork(client_socket, True)
+                        msg_type, payload = result
+                        self._handle_message(client_socket, msg_type, payload, conn.key)
+                        handled += 1
+                finally:
+                    if corked:
+                        _set_cork(client_socket, False)
+
+                if not parser.buffered and not readable and self._park_client(conn):
+                    parked = True
+                    return
+                readable = False
+
+                n = client_socket.recv_into(recv_buf)
+                if not n:
+                    break
 
-                    msg_type, payload = result
-                    self._handle_message(client_socket, msg_type, payload, encryption_key)
+                parser.feed(recv_view[:n])
 
         except socket.timeout:
-            logger.warning(f"Connection timeout from {addr}")
+            if parser.buffered:
+                logger.warning(f"Connection timeout from {conn.addr}")
+            else:
+                # Idle persistent connection, nothing was in flight
+                logger.debug(f"Idle connection from {conn.addr} timed out")
         except Exception as e:
-            logger.error(f"Error handling client {addr}: {e}")
+            logger.error(f"Error handling client {conn.addr}: {e}")
         finally:
-            client_socket.close()
+            if not parked:
+                self._untrack_client(client_socket)
+                client_socket.close()
+
+    def _track_client(self, sock: socket.socket):
+        """Note that a worker is using sock, so stop() can unblock it"""
+        with self._active_clients_lock:
+            self._active_clients.add(sock)
+
+    def _untrack_client(self, sock: socket.socket):
+        with self._active_clients_lock:
+            self._active_clients.discard(sock)
 
     def _authenticate_client(self, client_socket: socket.socket, addr: tuple, key: bytes) -> bool:
         """
         Authenticate a client using challenge-response
 
+        Only the auth response frame is read; messages the client pipelined
+        behind it are left on the socket for the connection loop.
+
         Returns True if authenticated, False otherwise
         """
         try:
             logger.debug(f"Server auth starting - key hash: {hashlib.sha256(key).hexdigest()[:16]}")
             # Generate random challenge
-            challenge = os.urandom(32)
+            challenge = _fresh_challenge()
 
             # Send challenge
             client_socket.sendall(MessageBuilder.build_auth_challenge(challenge))
 
             # Receive response
             client_socket.settimeout(10.0)
-            data = client_socket.recv(config.BUFFER_SIZE)
-
-            if not data:
-                logger.warning(f"No auth response from {addr}")
-                return False
-
-            logger.debug(f"Auth raw recv ({len(data)} bytes): {data[:50].hex()}...")
-
-            parser = MessageParser()
-            parser.feed(data)
-            result = parser.parse_one()
+            result = _read_handshake(client_socket)
 
             if not result:
-                logger.warning(f"Invalid auth response from {addr}")
+                logger.warning(f"No valid auth response from {addr}")
                 return False
 
             msg_type, payload = result
@@ -277,10 +935,10 @@ class SyncAgent:
                 client_socket.sendall(MessageBuilder.build_auth_failure("Invalid response"))
                 return False
 
-            # Verify response: should be HMAC(challenge, key)
-            expected = hashlib.sha256(challenge + key).digest()
+            # Verify response: should be HMAC(challenge, key), compared in constant time
+            expected = _auth_response(challenge, key)
 
-            if payload != expected:
+            if not hmac.compare_digest(payload, expected):
                 logger.warning(f"Auth failed from {addr} - invalid response")
                 logger.debug(f"Challenge: {challenge.hex()[:16]}...")
                 logger.debug(f"Key hash: {hashlib.sha256(key).hexdigest()[:16]}")
@@ -403,6 +1061,194 @@ class SyncAgent:
             self._peer_port = port or self.port
         logger.info(f"Peer set to {ip}:{self._peer_port}")
     
+    def _drop_peer_connection(self):
+        """Close the cached peer connection. Caller must hold _conn_lock."""
+        if self._peer_conn:
+            self._safe_close_socket(self._peer_conn)
+        self._peer_conn = None
+        self._peer_parser = None
+        self._peer_conn_key = None
+
+    def _peer_connection_alive(self) -> bool:
+        """Check whether the cached connection can be reused"""
+        return _connection_reusable(self._peer_conn, self._peer_conn_used)
+
+    def _peer_request(self, peer_ip: str, peer_port: int, key: Optional[bytes],
+                      message: bytes, expect_reply: bool = True,
+                      body_files: Optional[List[Tuple[Path, int]]] = None) -> Optional[tuple]:
+        """
+        Send a message to the peer over the cached connection.
+
+        Opens and authenticates a connection on first use (sending the message
+        in the same write as the auth response) and keeps it for later calls.
+        A reused connection that turns out to be dead is replaced once.
+
+        Args:
+            peer_ip: Peer address
+            peer_port: Peer port
+            key: Encryption key, or None when unpaired
+            message: Complete frame to send
+            expect_reply: Wait for and return one reply message
+            body_files: (path, size) pairs streamed with sendfile right after
+                        message, for frames whose length prefix covers them
+
+        Returns:
+            (msg_type, payload) of the reply, an empty tuple once sent if
+            expect_reply is False, or None if authentication failed or the
+            peer closed without replying
+
+        Raises:
+            OSError: On socket errors (including socket.timeout)
+        """
+        conn_key = (peer_ip, peer_port, key)
+
+        with self._conn_lock:
+            for attempt in range(2):
+                reused = (
+                    self._peer_conn is not None
+                    and self._peer_conn_key == conn_key
+                    and self._peer_connection_alive()
+                )
+
+                try:
+                    if reused:
+                        sock, parser = self._peer_conn, self._peer_parser
+                        sock.sendall(message)
+                    else:
+                        self._drop_peer_connection()
+                        conn = self._open_peer_connection(peer_ip, peer_port, key, message)
+                        if conn is None:
+                            logger.error("Authentication with peer failed")
+                            return None
+                        sock, parser = conn
+                        self._peer_conn, self._peer_parser = sock, parser
+                        self._peer_conn_key = conn_key
+
+                    for path, size in body_files or ():
+                        _sendfile_exact(sock, path, size)
+
+                    self._peer_conn_used = time.time()
+                    if not expect_reply:
+                        return ()
+
+                    result = self._read_reply(sock, parser)
+                except ConnectionError:
+                    self._drop_peer_connection()
+                    if reused and attempt == 0:
+                        continue
+                    raise
+                except Exception:
+                    # Also covers a short file body: the stream is out of sync
+                    self._drop_peer_connection()
+                    raise
+
+                if result is None:
+                    # Peer hung up before replying
+                    self._drop_peer_connection()
+                    if reused and attempt == 0:
+                        continue
+                    return None
+
+                self._peer_conn_used = time.time()
+                return result
+
+        return None
+
+    def _open_peer_connection(self, peer_ip: str, peer_port: int, key: Optional[bytes],
+                              message: bytes, bulk: bool = False) -> Optional[Tuple[socket.socket, MessageParser]]:
+        """
+        Connect (and authenticate, if pairing is required) and send the first message
+
+        bulk marks a connection that will receive file data (see _size_bulk_socket).
+
+        Returns (socket, parser), or None if authentication failed
+        """
+        sock = _connect_unix(peer_port) if peer_ip in LOOPBACK_HOSTS else None
+        connected = sock is not None
+        if not connected:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            if bulk:
+                _size_bulk_socket(sock)
+        sock.settimeout(30.0)
+        try:
+            if not connected:
+                sock.connect((peer_ip, peer_port))
+                _tune_socket(sock)
+
+            parser = MessageParser(key=key)
+            if self.require_pairing and key:
+                if not self._authenticate_with_server(sock, key, pipelined=message):
+                    self._safe_close_socket(sock)
+                    return None
+            else:
+                sock.sendall(message)
+        except BaseException:
+            self._safe_close_socket(sock)
+            raise
+
+        return sock, parser
+
+    def _checkout_download_connection(self, conn_key: tuple) -> Optional[Tuple[socket.socket, MessageParser]]:
+        """Take an idle, still usable download connection to the peer, if any"""
+        with self._download_conns_lock:
+            idle = self._download_conns.get(conn_key)
+            while idle:
+                sock, parser, last_used = idle.pop()
+                if _connection_reusable(sock, last_used):
+                    return sock, parser
+                self._safe_close_socket(sock)
+        return None
+
+    def _checkin_download_connection(self, conn_key: tuple, sock: socket.socket, parser: MessageParser):
+        """
+        Keep a connection whose download completed cleanly for the next one.
+
+        At most config.DOWNLOAD_CONNECTIONS are kept per peer, and connections
+        that have gone stale are closed here rather than waiting for reuse.
+        """
+        if parser.buffered:
+            # Unexpected trailing data: the stream can't be trusted
+            self._safe_close_socket(sock)
+            return
+        now = time.time()
+        with self._download_conns_lock:
+            for key, idle in list(self._download_conns.items()):
+                for entry in [e for e in idle if now - e[2] > config.PEER_CONNECTION_IDLE]:
+                    idle.remove(entry)
+                    self._safe_close_socket(entry[0])
+                if not idle:
+                    del self._download_conns[key]
+
+            idle = self._download_conns.setdefault(conn_key, [])
+            if len(idle) < config.DOWNLOAD_CONNECTIONS:
+                idle.append((sock, parser, now))
+                return
+        self._safe_close_socket(sock)
+
+    def _close_download_connections(self):
+        """Close every idle download connection"""
+        with self._download_conns_lock:
+            for idle in self._download_conns.values():
+                for sock, _, _ in idle:
+                    self._safe_close_socket(sock)
+            self._download_conns.clear()
+
+    def _read_reply(self, sock: socket.socket, parser: MessageParser) -> Optional[tuple]:
+        """
+        Read one message, using anything already buffered in the parser first.
+
+        Caller must hold _conn_lock, which guards the reused receive buffer.
+        """
+        recv_view = memoryview(self._peer_recv_buf)
+        while True:
+            result = parser.parse_one()
+            if result is not None:
+                return result
+            n = sock.recv_into(recv_view)
+            if not n:
+                return None
+            parser.feed(recv_view[:n])
+
     def send_files(self, file_paths: List[Path]) -> bool:
         """
         Send files to the connected peer
@@ -438,16 +1284,8 @@ class SyncAgent:
                 return False
 
         try:
-            # Pack files
-            metadata, file_data = pack_files(file_paths)
-
-            # Check size limit
-            if metadata.total_size > config.MAX_TOTAL_SIZE:
-                logger.error(f"Total size {metadata.total_size} exceeds limit {config.MAX_TOTAL_SIZE}")
-                return False
-
-            # Create hash to detect loops
-            content_hash = hashlib.md5(file_data[:1024]).hexdigest()
+            # Create hash to detect loops (from file metadata, so payload bytes are never touched)
+            content_hash = _file_set_hash(file_paths)
 
             # Avoid sending duplicates
             current_time = time.time()
@@ -455,58 +1293,44 @@ class SyncAgent:
                 logger.debug("Skipping duplicate send")
                 return True
 
-            # Build message (encrypted if we have a key)
-            message = MessageBuilder.build_file_transfer(metadata, file_data, encryption_key)
+            # Collect metadata; file contents are only read when sending
+            metadata, sources = collect_files(file_paths)
 
-            # Connect and send
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(30.0)
-
-            try:
-                sock.connect((peer_ip, peer_port))
-
-                # Authenticate with server if pairing enabled
-                if self.require_pairing and encryption_key:
-                    if not self._authenticate_with_server(sock, encryption_key):
-                        logger.error("Authentication with peer failed")
-                        return False
-
-                # Send in chunks
-                total_sent = 0
-                while total_sent < len(message):
-                    sent = sock.send(message[total_sent:total_sent + config.BUFFER_SIZE])
-                    if sent == 0:
-                        raise RuntimeError("Socket connection broken")
-                    total_sent += sent
-
-                # Wait for ACK
-                parser = MessageParser(key=encryption_key)
-                while True:
-                    data = sock.recv(config.BUFFER_SIZE)
-                    if not data:
-                        break
+            # Check size limit
+            if metadata.total_size > config.MAX_TOTAL_SIZE:
+                logger.error(f"Total size {metadata.total_size} exceeds limit {config.MAX_TOTAL_SIZE}")
+                return False
 
-                    parser.feed(data)
-                    result = parser.parse_one()
-                    if result:
-                        msg_type, payload = result
-                        if msg_type == MessageType.FILE_ACK:
-                            ack = MessageParser.parse_ack(payload)
-                            if ack['success']:
-                                logger.info(f"Files sent successfully ({metadata.total_size} bytes)")
-                                self._last_sent_hash = content_hash
-                                self._last_sent_time = current_time
-                                return True
-                            else:
-                                logger.error(f"Peer rejected files: {ack['message']}")
-                                return False
-                        elif msg_type == MessageType.AUTH_FAILURE:
-                            logger.error(f"Authentication rejected: {payload.decode('utf-8', errors='ignore')}")
-                            return False
-                        break
+            if encryption_key:
+                # Sealed as a single AES-GCM message, so the payload must be in memory
+                file_data = b''.join(source.read_bytes() for source in sources)
+                message = MessageBuilder.build_file_transfer(metadata, file_data, encryption_key)
+                body_files = None
+            else:
+                # Send the header, then stream file contents straight from disk
+                message = MessageBuilder.build_file_transfer_header(metadata)
+                body_files = [(source, info.size) for source, info in zip(sources, metadata.files)]
+
+            # Send over the peer connection and wait for the ACK
+            result = self._peer_request(peer_ip, peer_port, encryption_key, message,
+                                        body_files=body_files)
+            if result is None:
+                return False
 
-            finally:
-                self._safe_close_socket(sock)
+            msg_type, payload = result
+            if msg_type == MessageType.FILE_ACK:
+                ack = MessageParser.parse_ack(payload)
+                if ack['success']:
+                    logger.info(f"Files sent successfully ({metadata.total_size} bytes)")
+                    self._last_sent_hash = content_hash
+                    self._last_sent_time = current_time
+                    return True
+                else:
+                    logger.error(f"Peer rejected files: {ack['message']}")
+                    return False
+            elif msg_type == MessageType.AUTH_FAILURE:
+                logger.error(f"Authentication rejected: {payload.decode('utf-8', errors='ignore')}")
+                return False
 
         except socket.timeout:
             logger.error("Timeout sending files to peer")
@@ -556,7 +1380,7 @@ class SyncAgent:
 
         try:
             # Create hash to detect loops
-            text_hash = hashlib.md5(text.encode('utf-8')).hexdigest()
+            text_hash = hash(text)
 
             # Avoid sending duplicates
             current_time = time.time()
@@ -567,50 +1391,25 @@ class SyncAgent:
             # Build message (encrypted if we have a key)
             message = MessageBuilder.build_text_transfer(text, encryption_key)
 
-            # Connect and send
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(30.0)
-
-            try:
-                sock.connect((peer_ip, peer_port))
-
-                # Authenticate with server if pairing enabled
-                if self.require_pairing and encryption_key:
-                    if not self._authenticate_with_server(sock, encryption_key):
-                        logger.error("Authentication with peer failed")
-                        return False
-
-                # Send message
-                sock.sendall(message)
-
-                # Wait for ACK
-                parser = MessageParser(key=encryption_key)
-                while True:
-                    data = sock.recv(config.BUFFER_SIZE)
-                    if not data:
-                        break
-
-                    parser.feed(data)
-                    result = parser.parse_one()
-                    if result:
-                        msg_type, payload = result
-                        if msg_type == MessageType.TEXT_ACK:
-                            ack = MessageParser.parse_text_ack(payload)
-                            if ack['success']:
-                                logger.info(f"Text sent successfully ({len(text)} chars)")
-                                self._last_sent_text_hash = text_hash
-                                self._last_sent_text_time = current_time
-                                return True
-                            else:
-                                logger.error(f"Peer rejected text: {ack['message']}")
-                                return False
-                        elif msg_type == MessageType.AUTH_FAILURE:
-                            logger.error(f"Authentication rejected: {payload.decode('utf-8', errors='ignore')}")
-                            return False
-                        break
+            # Send over the peer connection and wait for the ACK
+            result = self._peer_request(peer_ip, peer_port, encryption_key, message)
+            if result is None:
+                return False
 
-            finally:
-                self._safe_close_socket(sock)
+            msg_type, payload = result
+            if msg_type == MessageType.TEXT_ACK:
+                ack = MessageParser.parse_text_ack(payload)
+                if ack['success']:
+                    logger.info(f"Text sent successfully ({len(text)} chars)")
+                    self._last_sent_text_hash = text_hash
+                    self._last_sent_text_time = current_time
+                    return True
+                else:
+                    logger.error(f"Peer rejected text: {ack['message']}")
+                    return False
+            elif msg_type == MessageType.AUTH_FAILURE:
+                logger.error(f"Authentication rejected: {payload.decode('utf-8', errors='ignore')}")
+                return False
 
         except socket.timeout:
             logger.error("Timeout sending text to peer")
@@ -624,27 +1423,30 @@ class SyncAgent:
 
         return False
 
-    def _authenticate_with_server(self, sock: socket.socket, key: bytes) -> bool:
+    def _authenticate_with_server(self, sock: socket.socket, key: bytes,
+                                  pipelined: Optional[bytes] = None) -> bool:
         """
         Authenticate with the server using challenge-response
 
+        Only the handshake frames are read, so a reply the server sends right
+        after AUTH_SUCCESS is left on the socket for the caller.
+
+        Args:
+            sock: Connected socket
+            key: Shared encryption key
+            pipelined: Message to send in the same write as the auth response,
+                       instead of waiting a round trip for AUTH_SUCCESS first.
+                       The server holds it until authentication completes.
+
         Returns True if authenticated, False otherwise
         """
         try:
             # Receive challenge
             sock.settimeout(10.0)
-            data = sock.recv(config.BUFFER_SIZE)
-
-            if not data:
-                logger.warning("No challenge from server")
-                return False
-
-            parser = MessageParser()
-            parser.feed(data)
-            result = parser.parse_one()
+            result = _read_handshake(sock)
 
             if not result:
-                logger.warning("Invalid challenge from server")
+                logger.warning("No valid challenge from server")
                 return False
 
             msg_type, payload = result
@@ -657,8 +1459,8 @@ class SyncAgent:
                 logger.warning(f"Unexpected message type {msg_type}")
                 return False
 
-            # Compute response: SHA256(challenge + key)
-            response = hashlib.sha256(payload + key).digest()
+            # Compute response: HMAC-SHA256(key, challenge)
+            response = _auth_response(payload, key)
             logger.debug(f"Auth - Challenge: {payload.hex()[:16]}...")
             logger.debug(f"Auth - Key hash: {hashlib.sha256(key).hexdigest()[:16]}")
             logger.debug(f"Auth - Response: {response.hex()[:16]}...")
@@ -666,16 +1468,13 @@ class SyncAgent:
             # Send response
             auth_msg = MessageBuilder.build_auth_response(response)
             logger.debug(f"Auth sending ({len(auth_msg)} bytes): {auth_msg.hex()}...")
-            sock.sendall(auth_msg)
+            if pipelined:
+                _send_frames(sock, auth_msg, pipelined)
+            else:
+                sock.sendall(auth_msg)
 
             # Wait for success/failure
-            data = sock.recv(config.BUFFER_SIZE)
-            if not data:
-                return False
-
-            parser = MessageParser()
-            parser.feed(data)
-            result = parser.parse_one()
+            result = _read_handshake(sock)
 
             if result and result[0] == MessageType.AUTH_SUCCESS:
                 logger.debug("Authentication successful")
@@ -708,13 +1507,10 @@ class SyncAgent:
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             sock.settimeout(5.0)
             sock.connect((peer_ip, peer_port))
+            _tune_socket(sock)
             sock.sendall(MessageBuilder.build_ping())
 
-            data = sock.recv(config.BUFFER_SIZE)
-
-            parser = MessageParser()
-            parser.feed(data)
-            result = parser.parse_one()
+            result = _read_handshake(sock)
 
             if result and result[0] == MessageType.PONG:
                 return True
@@ -782,26 +1578,12 @@ class SyncAgent:
             # Build and send announce message
             message = MessageBuilder.build_file_announce(metadata, encryption_key)
 
-            # Connect and send
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(30.0)
-
-            try:
-                sock.connect((peer_ip, peer_port))
-
-                # Authenticate if required
-                if self.require_pairing and encryption_key:
-                    if not self._authenticate_with_server(sock, encryption_key):
-                        logger.error("Authentication with peer failed")
-                        return None
-
-                sock.sendall(message)
-                logger.info(f"Announced {len(metadata.files)} files ({format_bytes(metadata.total_size)}) - transfer_id: {transfer_id}")
-
-                return transfer_id
+            # Send over the peer connection (no reply for announcements)
+            if self._peer_request(peer_ip, peer_port, encryption_key, message, expect_reply=False) is None:
+                return None
 
-            finally:
-                self._safe_close_socket(sock)
+            logger.info(f"Announced {len(metadata.files)} files ({format_bytes(metadata.total_size)}) - transfer_id: {transfer_id}")
+            return transfer_id
 
         except Exception as e:
             logger.error(f"Error announcing files: {e}")
@@ -879,8 +1661,10 @@ class SyncAgent:
         sock = None
         try:
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            _size_bulk_socket(sock)
             sock.settimeout(self._transfer_manager.chunk_timeout)
             sock.connect((peer_ip, peer_port))
+            _tune_socket(sock)
 
             # Authenticate if required
             if self.require_pairing and encryption_key:
@@ -891,10 +1675,35 @@ class SyncAgent:
                     return None
 
             parser = MessageParser(key=encryption_key)
+            recv_buf = bytearray(_bulk_recv_size(metadata.chunk_size))
+            recv_view = memoryview(recv_buf)
             total_bytes_received = resume_offset
 
-            # Request each file
+            # Requests go out up to config.FILE_REQUEST_WINDOW files ahead of the
+            # one being received, so the peer starts on the next file without
+            # waiting a round trip. It serves them in order on this connection.
+            offsets = []
+            requests = []
+            bytes_before = 0  # Total size of the files preceding this one
             for file_info in metadata.files:
+                # Calculate offset for this file (for resume)
+                file_offset = 0
+                if checkpoint and checkpoint.file_index == file_info.file_index:
+                    # Resume this specific file
+                    file_offset = max(0, checkpoint.bytes_transferred - bytes_before)
+                bytes_before += file_info.size
+                offsets.append(file_offset)
+                requests.append(MessageBuilder.build_file_request(
+                    transfer_id,
+                    file_info.file_index,
+                    file_offset,
+                    encryption_key
+                ))
+            requested = 0
+            progress = ProgressThrottle()
+
+            # Receive each file
+            for position, file_info in enumerate(metadata.files):
                 # Check for cancellation
                 if cancel_event.is_set():
                     logger.info(f"Transfer cancelled: {transfer_id}")
@@ -911,129 +1720,144 @@ class SyncAgent:
 
                 # Create writer for this file
                 writer = ChunkedFileWriter(file_dest, file_info.size, file_info.checksum)
+                pending_writes = deque()  # (offset, future) of chunks being verified
+                final_path = None
+                try:
+                    # Send requests (with offset for resume) to fill the window
+                    window_end = min(len(requests), position + config.FILE_REQUEST_WINDOW)
+                    if requested < window_end:
+                        _send_frames(sock, *requests[requested:window_end])
+                        requested = window_end
+
+                    # Receive chunks with retry support
+                    file_bytes_received = offsets[position]
+                    consecutive_errors = 0
+
+                    while file_bytes_received < file_info.size:
+                        # Check for cancellation
+                        if cancel_event.is_set():
+                            logger.info(f"Transfer cancelled during file: {file_info.name}")
+                            self._registry.cancel_transfer(transfer_id, "User cancelled")
+                            return None
+
+                        try:
+                            # Parse what is already buffered before reading, since
+                            # the previous read may have carried this file's chunks
+                            # too. ACKs for every chunk parsed go out in one write.
+                            pending_acks = []
+                            while True:
+                                result = parser.parse_one()
+                                if result is None:
+                                    break
 
-                # Calculate offset for this file (for resume)
-                file_offset = 0
-                if checkpoint and checkpoint.file_index == file_info.file_index:
-                    # Resume this specific file
-                    file_offset = checkpoint.bytes_transferred - sum(
-                        f.size for f in metadata.files[:file_info.file_index]
-                    )
-                    file_offset = max(0, file_offset)
-
-                # Send request (with offset for resume)
-                request_msg = MessageBuilder.build_file_request(
-                    transfer_id,
-                    file_info.file_index,
-                    file_offset,
-                    encryption_key
-                )
-                sock.sendall(request_msg)
-
-                # Receive chunks with retry support
-                file_bytes_received = file_offset
-                consecutive_errors = 0
+                                msg_type, payload = result
+
+                                if msg_type == MessageType.FILE_CHUNK:
+                                    chunk_info, chunk_data = MessageParser.parse_file_chunk(payload)
+                                    if chunk_info.file_index != file_info.file_index:
+                                        raise RuntimeError(
+                                            f"Chunk for file {chunk_info.file_index} "
+                                            f"while receiving {file_info.file_index}"
+                                        )
+
+                                    # Verify and write the chunk off this thread, keeping
+                                    # a bounded number in flight
+                                    pending_writes.append((chunk_info.offset, self._queue_chunk_write(
+                                        writer, chunk_info.offset, chunk_data, chunk_info.checksum
+                                    )))
+                                    self._collect_chunk_writes(pending_writes, keep=2 * config.VERIFY_WORKERS)
+
+                                    file_bytes_received += len(chunk_data)
+                                    total_bytes_received += len(chunk_data)
+
+                                    # Update progress in registry and transfer manager,
+                                    # rate-limited rather than once per chunk
+                                    if progress.should_report(total_bytes_received, final=chunk_info.is_last):
+                                        self._registry.update_transfer_progress(
+                                            transfer_id,
+                                            total_bytes_received,
+                                            file_info.file_index
+                                        )
+                                        self._transfer_manager.update_progress(
+                                            transfer_id,
+                                            file_info.file_index,
+                                            total_bytes_received,
+                                            chunk_info.chunk_index
+                                        )
+
+                                        if self.on_transfer_progress:
+                                            self.on_transfer_progress(
+                                                transfer_id,
+                                                total_bytes_received,
+                                                metadata.total_size,
+                                                file_info.name
+                                            )
+
+                                    # Queue ACK for flow control
+                                    pending_acks.append(MessageBuilder.build_file_chunk_ack(
+                                        transfer_id,
+                                        file_info.file_index,
+                                        chunk_info.chunk_index,
+                                        encryption_key
+                                    ))
 
-                while file_bytes_received < file_info.size:
-                    # Check for cancellation
-                    if cancel_event.is_set():
-                        logger.info(f"Transfer cancelled during file: {file_info.name}")
-                        writer.cleanup()
-                        self._registry.cancel_transfer(transfer_id, "User cancelled")
-                        return None
+                                    if chunk_info.is_last:
+                                        break
 
-                    try:
-                        data = sock.recv(config.BUFFER_SIZE)
-                        if not data:
-                            raise RuntimeError("Connection closed during transfer")
+                                elif msg_type == MessageType.TRANSFER_ERROR:
+                                    error_info = MessageParser.parse_transfer_error(payload)
+                                    raise RuntimeError(f"Peer error: {error_info['error']}")
 
-                        parser.feed(data)
-                        consecutive_errors = 0  # Reset on successful receive
-                        self._transfer_manager.reset_retry_count(transfer_id)
+                            if pending_acks:
+                                _send_frames(sock, *pending_acks)
 
-                        while True:
-                            result = parser.parse_one()
-                            if result is None:
+                            if file_bytes_received >= file_info.size:
                                 break
 
-                            msg_type, payload = result
-
-                            if msg_type == MessageType.FILE_CHUNK:
-                                chunk_info, chunk_data = MessageParser.parse_file_chunk(payload)
-
-                                # Write chunk
-                                if not writer.write_chunk(chunk_info.offset, chunk_data, chunk_info.checksum):
-                                    raise RuntimeError(f"Checksum mismatch at offset {chunk_info.offset}")
-
-                                file_bytes_received += len(chunk_data)
-                                total_bytes_received += len(chunk_data)
-
-                                # Update progress in registry and transfer manager
-                                self._registry.update_transfer_progress(
-                                    transfer_id,
-                                    total_bytes_received,
-                                    file_info.file_index
-                                )
-                                self._transfer_manager.update_progress(
-                                    transfer_id,
-                                    file_info.file_index,
-                                    total_bytes_received,
-                                    chunk_info.chunk_index
-                                )
-
-                                if self.on_transfer_progress:
-                                    self.on_transfer_progress(
-                                        transfer_id,
-                                        total_bytes_received,
-                                        metadata.total_size,
-                                        file_info.name
-                                    )
-
-                                # Send ACK for flow control
-                                ack_msg = MessageBuilder.build_file_chunk_ack(
-                                    transfer_id,
-                                    file_info.file_index,
-                                    chunk_info.chunk_index,
-                                    encryption_key
-                                )
-                                sock.sendall(ack_msg)
-
-                                if chunk_info.is_last:
-                                    break
+                            n = sock.recv_into(recv_buf)
+                            if not n:
+                                raise RuntimeError("Connection closed during transfer")
 
-                            elif msg_type == MessageType.TRANSFER_ERROR:
-                                error_info = MessageParser.parse_transfer_error(payload)
-                                raise RuntimeError(f"Peer error: {error_info['error']}")
+                            parser.feed(recv_view[:n])
+                            consecutive_errors = 0  # Reset on successful receive
+                            self._transfer_manager.reset_retry_count(transfer_id)
 
-                    except socket.timeout:
-                        consecutive_errors += 1
-                        should_retry, delay, attempt = self._transfer_manager.should_retry_chunk(
-                            transfer_id, "Timeout waiting for chunk"
-                        )
-                        if should_retry:
-                            logger.warning(f"Timeout, retrying in {delay:.1f}s (attempt {attempt})")
-                            time.sleep(delay)
-                            continue
-                        else:
-                            raise RuntimeError(f"Transfer timeout after {attempt} retries")
+                        except socket.timeout:
+                            consecutive_errors += 1
+                            should_retry, delay, attempt = self._transfer_manager.should_retry_chunk(
+                                transfer_id, "Timeout waiting for chunk"
+                            )
+                            if should_retry:
+                                logger.warning(f"Timeout, retrying in {delay:.1f}s (attempt {attempt})")
+                                time.sleep(delay)
+                                continue
+                            else:
+                                raise RuntimeError(f"Transfer timeout after {attempt} retries")
 
-                    except Exception as e:
-                        consecutive_errors += 1
-                        should_retry, delay, attempt = self._transfer_manager.should_retry_chunk(
-                            transfer_id, str(e)
-                        )
-                        if should_retry and consecutive_errors < 5:
-                            logger.warning(f"Error: {e}, retrying in {delay:.1f}s (attempt {attempt})")
-                            time.sleep(delay)
-                            continue
-                        else:
-                            raise
+                        except Exception as e:
+                            consecutive_errors += 1
+                            should_retry, delay, attempt = self._transfer_manager.should_retry_chunk(
+                                transfer_id, str(e)
+                            )
+                            if should_retry and consecutive_errors < 5:
+                                logger.warning(f"Error: {e}, retrying in {delay:.1f}s (attempt {attempt})")
+                                time.sleep(delay)
+                                continue
+                            else:
+                                raise
 
-                # Finalize file
-                final_path = writer.finalize()
-                downloaded_files.append(final_path)
-                self._registry.add_downloaded_file(transfer_id, final_path)
-                logger.info(f"Downloaded: {final_path}")
+                    # Finalize file once every chunk has been verified and written
+                    self._collect_chunk_writes(pending_writes)
+                    final_path = writer.finalize()
+                    downloaded_files.append(final_path)
+                    self._registry.add_downloaded_file(transfer_id, final_path)
+                    logger.info(f"Downloaded: {final_path}")
+                finally:
+                    if final_path is None:
+                        # Cancelled or failed: stop its queued writes before the
+                        # temp file goes, and don't leave the file behind
+                        self._abandon_chunk_writes(pending_writes)
+                        writer.cleanup()
 
             # Send completion
             complete_msg = MessageBuilder.build_transfer_complete(transfer_id, encryption_key)
@@ -1065,6 +1889,48 @@ class SyncAgent:
         finally:
             self._safe_close_socket(sock)
 
+    def _queue_chunk_write(self, writer: ChunkedFileWriter, offset: int, data, checksum: str):
+        """
+        Verify a chunk on the verify pool, then write it on the write thread.
+
+        Checksums run in parallel, but the write thread takes chunks in the
+        order they were queued, waiting for each one's checksum, so the file
+        is written front to back without seeks. Returns a future that is
+        True once the chunk is written, False if it failed verification.
+        """
+        verified = self._verify_pool.submit(ChunkedFileWriter.verify_chunk, offset, data, checksum)
+
+        def write() -> bool:
+            if not verified.result():
+                return False
+            writer.write_verified(offset, data)
+            return True
+
+        return self._write_pool.submit(write)
+
+    @staticmethod
+    def _collect_chunk_writes(pending: deque, keep: int = 0, check: bool = True):
+        """
+        Wait for queued chunk writes, oldest first, until at most keep remain.
+
+        Raises RuntimeError if check is set and a chunk failed verification.
+        """
+        while len(pending) > keep:
+            offset, future = pending.popleft()
+            if future.cancelled():
+                continue
+            if not check:
+                future.exception()  # Just wait for it to finish
+            elif not future.result():
+                raise RuntimeError(f"Checksum mismatch at offset {offset}")
+
+    @classmethod
+    def _abandon_chunk_writes(cls, pending: deque):
+        """Cancel queued chunk writes and wait out the ones already running"""
+        for _, future in pending:
+            future.cancel()
+        cls._collect_chunk_writes(pending, check=False)
+
     def cancel_transfer(self, transfer_id: str, reason: str = "User cancelled") -> bool:
         """
         Cancel an ongoing transfer.
@@ -1095,12 +1961,13 @@ class SyncAgent:
                     sock.settimeout(5.0)
                     try:
                         sock.connect((peer_ip, peer_port))
-
-                        if self.require_pairing and encryption_key:
-                            self._authenticate_with_server(sock, encryption_key)
+                        _tune_socket(sock)
 
                         cancel_msg = MessageBuilder.build_transfer_cancel(transfer_id, reason, encryption_key)
-                        sock.sendall(cancel_msg)
+                        if self.require_pairing and encryption_key:
+                            self._authenticate_with_server(sock, encryption_key, pipelined=cancel_msg)
+                        else:
+                            sock.sendall(cancel_msg)
                     finally:
                         self._safe_close_socket(sock)
             except Exception as e:
@@ -1112,7 +1979,7 @@ class SyncAgent:
         """Get list of transfers that can be resumed"""
         return self._transfer_manager.get_resumable_transfers()
 
-    def download_single_file(self, transfer_id: str, file_index: int) -> Optional[bytes]:
+    def download_single_file(self, transfer_id: str, file_index: int) -> Optional[bytearray]:
         """
         Download a single file and return its content as bytes.
 
@@ -1123,7 +1990,7 @@ class SyncAgent:
             file_index: Index of the file to download
 
         Returns:
-            File bytes or None on failure
+            File contents (filled in place, not copied again) or None on failure
         """
         # Get transfer info
         transfer_info = self._registry.get_transfer(transfer_id)
@@ -1135,13 +2002,7 @@ class SyncAgent:
             logger.error(f"Transfer expired: {transfer_id}")
             return None
 
-        # Find the file info
-        file_info = None
-        for f in transfer_info.metadata.files:
-            if f.file_index == file_index:
-                file_info = f
-                break
-
+        file_info = transfer_info.get_file_info(file_index)
         if not file_info:
             logger.error(f"File index {file_index} not found in transfer {transfer_id}")
             return None
@@ -1163,108 +2024,164 @@ class SyncAgent:
             logger.error("No peer available")
             return None
 
-        sock = None
-        file_data = bytearray()
-
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(60.0)
-            sock.connect((peer_ip, peer_port))
-
-            # Authenticate
-            if self.require_pairing and encryption_key:
-                if not self._authenticate_with_server(sock, encryption_key):
-                    logger.error("Authentication failed")
-                    return None
+        conn_key = (peer_ip, peer_port, encryption_key)
+        logger.info(f"Downloading: {file_info.name} ({format_bytes(file_info.size)})")
+        request_msg = MessageBuilder.build_file_request(
+            transfer_id,
+            file_index,
+            0,
+            encryption_key
+        )
+
+        # Prefer an idle connection from an earlier download; if it turns out
+        # to be dead, retry once on a fresh one
+        for attempt in range(2):
+            conn = self._checkout_download_connection(conn_key) if attempt == 0 else None
+            reused = conn is not None
+            sock = None
+            try:
+                if reused:
+                    sock, parser = conn
+                    sock.sendall(request_msg)
+                else:
+                    # The request rides along with the auth response
+                    conn = self._open_peer_connection(
+                        peer_ip, peer_port, encryption_key, request_msg, bulk=True
+                    )
+                    if conn is None:
+                        logger.error("Authentication failed")
+                        return None
+                    sock, parser = conn
+                sock.settimeout(60.0)
 
-            parser = MessageParser(key=encryption_key)
+                file_data = self._receive_file_chunks(
+                    sock, parser, transfer_id, file_info,
+                    transfer_info.metadata.chunk_size, encryption_key
+                )
+            except ConnectionError as e:
+                self._safe_close_socket(sock)
+                if reused:
+                    logger.debug(f"Pooled download connection failed ({e}), reconnecting")
+                    continue
+                logger.error(f"Download error: {e}")
+                return None
+            except Exception as e:
+                self._safe_close_socket(sock)
+                logger.error(f"Download error: {e}")
+                return None
 
-            # Request the file
-            logger.info(f"Downloading: {file_info.name} ({format_bytes(file_info.size)})")
+            if file_data is None:
+                self._safe_close_socket(sock)
+                return None
 
-            request_msg = MessageBuilder.build_file_request(
-                transfer_id,
-                file_index,
-                0,
-                encryption_key
-            )
-            sock.sendall(request_msg)
+            self._checkin_download_connection(conn_key, sock, parser)
+            logger.info(f"Downloaded: {file_info.name}")
+            return file_data
 
-            # Receive chunks
-            bytes_received = 0
-            while bytes_received < file_info.size:
-                data = sock.recv(config.BUFFER_SIZE)
-                if not data:
-                    raise RuntimeError("Connection closed")
+        return None
 
-                parser.feed(data)
+    def _receive_file_chunks(self, sock: socket.socket, parser: MessageParser, transfer_id: str,
+                             file_info, chunk_size: int, encryption_key: Optional[bytes]) -> Optional[bytearray]:
+        """
+        Receive the FILE_CHUNKs of one requested file into memory.
 
-                while True:
-                    result = parser.parse_one()
-                    if result is None:
-                        break
+        Returns the file contents, or None if the whole-file checksum doesn't
+        match. Raises ConnectionError if the peer closes the connection and
+        RuntimeError on a bad chunk or a peer error.
+        """
+        file_index = file_info.file_index
+        # Sized once up front; chunks are written straight to their offsets
+        file_data = bytearray(file_info.size)
+        # Whole-file checksum, updated as in-order chunks arrive
+        running = new_checksum()
+        next_offset = 0
+
+        # Receive chunks
+        bytes_received = 0
+        progress = ProgressThrottle()
+        recv_buf = bytearray(_bulk_recv_size(chunk_size))
+        recv_view = memoryview(recv_buf)
+        while bytes_received < file_info.size:
+            n = sock.recv_into(recv_buf)
+            if not n:
+                raise ConnectionError("Connection closed")
+
+            parser.feed(recv_view[:n])
+
+            # ACKs for every chunk in this read go out in one write
+            pending_acks = []
+            while True:
+                result = parser.parse_one()
+                if result is None:
+                    break
 
-                    msg_type, payload = result
+                msg_type, payload = result
 
-                    if msg_type == MessageType.FILE_CHUNK:
-                        chunk_info, chunk_data = MessageParser.parse_file_chunk(payload)
+                if msg_type == MessageType.FILE_CHUNK:
+                    chunk_info, chunk_data = MessageParser.parse_file_chunk(payload)
+                    if chunk_info.transfer_id != transfer_id or chunk_info.file_index != file_index:
+                        raise RuntimeError(
+                            f"Chunk for {chunk_info.transfer_id}/{chunk_info.file_index} "
+                            f"while receiving {transfer_id}/{file_index}"
+                        )
 
-                        # Verify chunk checksum
-                        actual_checksum = hashlib.md5(chunk_data).hexdigest()
-                        if actual_checksum != chunk_info.checksum:
-                            raise RuntimeError("Chunk checksum mismatch")
+                    # Chunks aren't checked one by one: nothing is kept unless
+                    # the whole-file checksum below matches, so each byte is
+                    # hashed once, by the running hash
+                    end = chunk_info.offset + len(chunk_data)
+                    if end > file_info.size:
+                        raise RuntimeError("Chunk past end of file")
+
+                    # Write data at its offset
+                    file_data[chunk_info.offset:end] = chunk_data
+                    if chunk_info.offset == next_offset and running is not None:
+                        running.update(chunk_data)
+                        next_offset = end
+                    else:
+                        # Out-of-order (shouldn't happen); hash the
+                        # assembled file at the end instead
+                        running = None
 
-                        # Append data at correct offset
-                        if chunk_info.offset == len(file_data):
-                            file_data.extend(chunk_data)
-                        else:
-                            # Handle out-of-order (shouldn't happen)
-                            if chunk_info.offset > len(file_data):
-                                file_data.extend(b'\x00' * (chunk_info.offset - len(file_data)))
-                            file_data[chunk_info.offset:chunk_info.offset + len(chunk_data)] = chunk_data
-
-                        bytes_received += len(chunk_data)
-
-                        # Progress callback
-                        if self.on_transfer_progress:
-                            self.on_transfer_progress(
-                                transfer_id,
-                                bytes_received,
-                                file_info.size,
-                                file_info.name
-                            )
+                    bytes_received += len(chunk_data)
 
-                        # Send ACK
-                        ack_msg = MessageBuilder.build_file_chunk_ack(
+                    # Progress callback, rate-limited
+                    if self.on_transfer_progress and progress.should_report(
+                            bytes_received, final=chunk_info.is_last):
+                        self.on_transfer_progress(
                             transfer_id,
-                            file_index,
-                            chunk_info.chunk_index,
-                            encryption_key
+                            bytes_received,
+                            file_info.size,
+                            file_info.name
                         )
-                        sock.sendall(ack_msg)
 
-                        if chunk_info.is_last:
-                            break
+                    # Queue ACK
+                    pending_acks.append(MessageBuilder.build_file_chunk_ack(
+                        transfer_id,
+                        file_index,
+                        chunk_info.chunk_index,
+                        encryption_key
+                    ))
 
-                    elif msg_type == MessageType.TRANSFER_ERROR:
-                        error = MessageParser.parse_transfer_error(payload)
-                        raise RuntimeError(f"Peer error: {error['error']}")
+                    if chunk_info.is_last:
+                        break
 
-            # Verify final checksum
-            final_checksum = hashlib.md5(file_data).hexdigest()
-            if final_checksum != file_info.checksum:
-                logger.error("File checksum mismatch")
-                return None
+                elif msg_type == MessageType.TRANSFER_ERROR:
+                    error = MessageParser.parse_transfer_error(payload)
+                    raise RuntimeError(f"Peer error: {error['error']}")
 
-            logger.info(f"Downloaded: {file_info.name}")
-            return bytes(file_data)
+            if pending_acks:
+                _send_frames(sock, *pending_acks)
 
-        except Exception as e:
-            logger.error(f"Download error: {e}")
+        # Verify final checksum
+        if running is not None:
+            final_checksum = running.hexdigest()
+        else:
+            final_checksum = calculate_checksum_bytes(file_data)
+        if final_checksum != file_info.checksum:
+            logger.error("File checksum mismatch")
             return None
 
-        finally:
-            self._safe_close_socket(sock)
+        return file_data
 
     def _handle_file_announce(self, client_socket: socket.socket, payload: bytes, key: bytes = None):
         """Handle FILE_ANNOUNCE - peer is offering files"""
@@ -1312,7 +2229,18 @@ class SyncAgent:
             transfer_info = self._registry.get_transfer(transfer_id)
             chunk_size = transfer_info.metadata.chunk_size if transfer_info else DEFAULT_CHUNK_SIZE
 
-            reader = ChunkedFileReader(file_path, chunk_size=chunk_size)
+            reader = ChunkedFileReader(
+                file_path,
+                chunk_size=chunk_size,
+                pool=self._chunk_pool,
+                checksum_cache=self._checksum_cache
+            )
+
+            if key is None:
+                # Unencrypted: chunk data can go straight from the file to the socket
+                self._send_file_chunks_zero_copy(client_socket, reader, transfer_id, file_index, offset)
+                logger.info(f"Finished streaming file {file_index} for transfer {transfer_id}")
+                return
 
             for chunk_index, chunk_offset, data, checksum, is_last in reader.read_chunks(offset):
                 chunk_info = ChunkInfo(
@@ -1332,6 +2260,10 @@ class SyncAgent:
 
             logger.info(f"Finished streaming file {file_index} for transfer {transfer_id}")
 
+        except _StreamDesync:
+            # Mid-frame: an error reply would land inside the chunk data.
+            # Let the connection loop drop the connection instead.
+            raise
         except Exception as e:
             logger.error(f"Error handling file request: {e}")
             try:
@@ -1344,6 +2276,35 @@ class SyncAgent:
             except:
                 pass
 
+    def _send_file_chunks_zero_copy(self, client_socket: socket.socket, reader: ChunkedFileReader,
+                                    transfer_id: str, file_index: int, offset: int):
+        """
+        Stream unencrypted FILE_CHUNK messages using socket.sendfile().
+
+        Only the small framing header is built in Python; the chunk data is
+        moved from the page cache to the socket by the kernel (sendfile(2)),
+        or by socket.sendfile's own read/send fallback where that is missing.
+        """
+        with open(reader.filepath, 'rb') as f:
+            for chunk_index, chunk_offset, size, checksum, is_last in reader.read_chunk_ranges(offset):
+                chunk_info = ChunkInfo(
+                    transfer_id=transfer_id,
+                    file_index=file_index,
+                    chunk_index=chunk_index,
+                    offset=chunk_offset,
+                    size=size,
+                    checksum=checksum,
+                    is_last=is_last
+                )
+
+                client_socket.sendall(MessageBuilder.build_file_chunk_header(chunk_info))
+                sent = client_socket.sendfile(f, chunk_offset, size)
+                if sent != size:
+                    # The frame header promised `size` bytes - the stream is unusable now
+                    raise _StreamDesync(f"File changed while streaming chunk {chunk_index}")
+
+                logger.debug(f"Sent chunk {chunk_index} ({size} bytes, last={is_last})")
+
     def _handle_file_chunk(self, client_socket: socket.socket, payload: bytes, key: bytes = None):
         """Handle FILE_CHUNK - receiving a chunk of file data"""
         transfer_id = None  # Initialize for safe access in except block
@@ -1366,12 +2327,7 @@ class SyncAgent:
                         logger.error(f"No transfer info for {transfer_id}")
                         return
 
-                    file_info = None
-                    for f in transfer_info.metadata.files:
-                        if f.file_index == file_index:
-                            file_info = f
-                            break
-
+                    file_info = transfer_info.get_file_info(file_index)
                     if not file_info:
                         logger.error(f"No file info for index {file_index}")
                         return
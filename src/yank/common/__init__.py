@@ -5,6 +5,7 @@ from .protocol import (
     TransferMetadata,
     MessageBuilder,
     MessageParser,
+    collect_files,
     pack_files,
     unpack_files
 )
@@ -16,6 +17,7 @@ __all__ = [
     'TransferMetadata',
     'MessageBuilder',
     'MessageParser',
+    'collect_files',
     'pack_files',
     'unpack_files',
     'PeerDiscovery',
@@ -4,23 +4,32 @@ Chunked file transfer utilities for memory-efficient large file handling.
 Provides:
 - ChunkedFileReader: Read files in chunks without loading entire file into memory
 - ChunkedFileWriter: Write chunks to temp file, verify checksum, atomic move
+- ChunkBufferPool: Reusable chunk buffers for the readers
+- ChunkChecksumCache: Per-chunk checksums of recently served files
 - ProgressTracker: Track transfer progress with speed and ETA calculation
+- ProgressThrottle: Rate-limit per-chunk progress reporting
 """
 import os
 import time
 import shutil
-import hashlib
+import queue
 import logging
 import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Iterator, Callable, Optional, List
 from dataclasses import dataclass, field
 
+from yank.common.protocol import calculate_checksum, calculate_checksum_bytes
+
 logger = logging.getLogger(__name__)
 
 # Default chunk size: 1MB
 DEFAULT_CHUNK_SIZE = 1024 * 1024
 
+# Write buffer for received files: 4MB, so in-order chunks are written together
+WRITE_BUFFER_SIZE = 4 * 1024 * 1024
+
 
 @dataclass
 class TransferStats:
@@ -72,6 +81,95 @@ class TransferStats:
         return time.time() - self.start_time
 
 
+class ChunkBufferPool:
+    """
+    Pool of reusable chunk-sized bytearrays.
+
+    Streaming a large file otherwise allocates a fresh chunk-sized buffer per
+    chunk. Buffers are handed out with acquire() and must be given back with
+    release() once nothing refers to their contents any more.
+
+    Usage:
+        pool = ChunkBufferPool(DEFAULT_CHUNK_SIZE, count=8)
+        buf = pool.acquire(chunk_size)
+        try:
+            ...
+        finally:
+            pool.release(buf)
+    """
+
+    def __init__(self, size: int = DEFAULT_CHUNK_SIZE, count: int = 8):
+        self.size = size
+        self.count = count
+        self._free = queue.SimpleQueue()
+
+    def acquire(self, size: Optional[int] = None) -> bytearray:
+        """
+        Get a buffer of at least size bytes (default: the pool's size).
+
+        Requests larger than the pool's buffers get a one-off allocation.
+        """
+        if size is not None and size > self.size:
+            return bytearray(size)
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            return bytearray(self.size)
+
+    def release(self, buf: bytearray):
+        """Return a buffer to the pool (dropped if foreign or the pool is full)"""
+        if len(buf) == self.size and self._free.qsize() < self.count:
+            self._free.put(buf)
+
+
+class ChunkChecksumCache:
+    """
+    Remember the per-chunk checksums of recently served files.
+
+    Serving a file again (a retried or repeated request) can then skip reading
+    it into user space just to checksum it, leaving only sendfile. Entries are
+    keyed by path and chunk size, dropped when the file's size or mtime
+    changes, and the least recently used file is evicted past max_files.
+    """
+
+    def __init__(self, max_files: int = 64):
+        self.max_files = max_files
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _stamp(filepath: Path) -> tuple:
+        st = os.stat(filepath)
+        return (st.st_size, st.st_mtime_ns)
+
+    def get(self, filepath: Path, chunk_size: int) -> Optional[List[str]]:
+        """Checksums for every chunk of the file, or None if not cached or stale"""
+        key = (str(filepath), chunk_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+        stamp, checksums = entry
+        try:
+            if self._stamp(filepath) == stamp:
+                return checksums
+        except OSError:
+            pass
+        with self._lock:
+            self._entries.pop(key, None)
+        return None
+
+    def put(self, filepath: Path, chunk_size: int, stamp: tuple, checksums: List[str]):
+        """Store checksums computed while the file had the given (size, mtime_ns) stamp"""
+        key = (str(filepath), chunk_size)
+        with self._lock:
+            self._entries[key] = (stamp, checksums)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_files:
+                self._entries.popitem(last=False)
+
+
 class ChunkedFileReader:
     """
     Read a file in chunks for memory-efficient streaming.
@@ -84,45 +182,118 @@ class ChunkedFileReader:
             send_chunk(chunk_info, data)
     """
 
-    def __init__(self, filepath: Path, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    def __init__(self, filepath: Path, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 pool: Optional[ChunkBufferPool] = None,
+                 checksum_cache: Optional[ChunkChecksumCache] = None):
         self.filepath = Path(filepath)
         self.chunk_size = chunk_size
-        self.file_size = self.filepath.stat().st_size
+        st = self.filepath.stat()
+        self.file_size = st.st_size
+        self._stamp = (st.st_size, st.st_mtime_ns)
         self.total_chunks = (self.file_size + chunk_size - 1) // chunk_size
+        self.pool = pool
+        self.checksum_cache = checksum_cache
+
+    def _acquire_buffer(self) -> bytearray:
+        if self.pool is not None:
+            return self.pool.acquire(self.chunk_size)
+        return bytearray(self.chunk_size)
+
+    def _release_buffer(self, buf: bytearray):
+        if self.pool is not None:
+            self.pool.release(buf)
 
     def read_chunks(self, start_offset: int = 0) -> Iterator[tuple]:
         """
         Yield (chunk_index, offset, data, checksum, is_last) tuples.
 
+        data is a memoryview into a reused buffer: it is only valid until the
+        next chunk is requested, so copy it if it has to outlive that.
+
+        Args:
+            start_offset: Byte offset to start reading from (for resume)
+        """
+        chunk_index = start_offset // self.chunk_size
+        current_offset = start_offset
+        buf = self._acquire_buffer()
+        view = memoryview(buf)[:self.chunk_size]
+
+        try:
+            with open(self.filepath, 'rb') as f:
+                f.seek(start_offset)
+
+                while True:
+                    size = f.readinto(view)
+                    if not size:
+                        break
+
+                    data = view[:size]
+                    checksum = calculate_checksum_bytes(data)
+                    is_last = (current_offset + size) >= self.file_size
+
+                    yield (chunk_index, current_offset, data, checksum, is_last)
+
+                    chunk_index += 1
+                    current_offset += size
+        finally:
+            self._release_buffer(buf)
+
+    def read_chunk_ranges(self, start_offset: int = 0) -> Iterator[tuple]:
+        """
+        Yield (chunk_index, offset, size, checksum, is_last) tuples.
+
+        Like read_chunks(), but the chunk data is not handed out - it is read
+        into a reused buffer only to checksum it. Used by senders that move
+        the bytes themselves (e.g. socket.sendfile). With a checksum_cache,
+        a file already served whole is not read at all.
+
         Args:
             start_offset: Byte offset to start reading from (for resume)
         """
+        if self.checksum_cache is not None and start_offset % self.chunk_size == 0:
+            cached = self.checksum_cache.get(self.filepath, self.chunk_size)
+            if cached is not None and len(cached) == self.total_chunks:
+                for chunk_index in range(start_offset // self.chunk_size, self.total_chunks):
+                    offset = chunk_index * self.chunk_size
+                    size = min(self.chunk_size, self.file_size - offset)
+                    yield (chunk_index, offset, size, cached[chunk_index],
+                           chunk_index == self.total_chunks - 1)
+                return
+
+        # Only a pass over the whole file can fill the cache
+        checksums = [] if self.checksum_cache is not None and start_offset == 0 else None
         chunk_index = start_offset // self.chunk_size
         current_offset = start_offset
+        buf = self._acquire_buffer()
+        view = memoryview(buf)[:self.chunk_size]
 
-        with open(self.filepath, 'rb') as f:
-            f.seek(start_offset)
+        try:
+            with open(self.filepath, 'rb') as f:
+                f.seek(start_offset)
 
-            while True:
-                data = f.read(self.chunk_size)
-                if not data:
-                    break
+                while True:
+                    size = f.readinto(view)
+                    if not size:
+                        break
 
-                checksum = hashlib.md5(data).hexdigest()
-                is_last = (current_offset + len(data)) >= self.file_size
+                    checksum = calculate_checksum_bytes(view[:size])
+                    is_last = (current_offset + size) >= self.file_size
+                    if checksums is not None:
+                        checksums.append(checksum)
 
-                yield (chunk_index, current_offset, data, checksum, is_last)
+                    yield (chunk_index, current_offset, size, checksum, is_last)
 
-                chunk_index += 1
-                current_offset += len(data)
+                    chunk_index += 1
+                    current_offset += size
+        finally:
+            self._release_buffer(buf)
+
+        if checksums is not None and current_offset == self.file_size:
+            self.checksum_cache.put(self.filepath, self.chunk_size, self._stamp, checksums)
 
     def get_file_checksum(self) -> str:
-        """Calculate full file MD5 checksum"""
-        hasher = hashlib.md5()
-        with open(self.filepath, 'rb') as f:
-            for chunk in iter(lambda: f.read(65536), b''):
-                hasher.update(chunk)
-        return hasher.hexdigest()
+        """Calculate full file checksum"""
+        return calculate_checksum(self.filepath)
 
 
 class ChunkedFileWriter:
@@ -147,14 +318,38 @@ class ChunkedFileWriter:
         self.dest_path.parent.mkdir(parents=True, exist_ok=True)
 
         self.bytes_written = 0
-        self.hasher = hashlib.md5()
         self._file = None
+        self._position = 0  # Offset the next buffered write lands at
         self._lock = threading.Lock()
 
     def _ensure_file_open(self):
         """Ensure the temp file is open for writing"""
         if self._file is None:
-            self._file = open(self.temp_path, 'wb')
+            self._file = open(self.temp_path, 'wb', buffering=WRITE_BUFFER_SIZE)
+            self._position = 0
+            self._preallocate()
+
+    def _preallocate(self):
+        """
+        Reserve the file's full size up front.
+
+        posix_fallocate lets the filesystem pick contiguous extents instead of
+        growing the file chunk by chunk; where it is missing or unsupported,
+        setting the length still gives the filesystem a size hint.
+        """
+        if self.expected_size <= 0:
+            return
+        fd = self._file.fileno()
+        try:
+            if hasattr(os, 'posix_fallocate'):
+                try:
+                    os.posix_fallocate(fd, 0, self.expected_size)
+                    return
+                except OSError as e:
+                    logger.debug(f"posix_fallocate failed for {self.temp_path}: {e}")
+            os.ftruncate(fd, self.expected_size)
+        except OSError as e:
+            logger.debug(f"Could not preallocate {self.temp_path}: {e}")
 
     def write_chunk(self, offset: int, data: bytes, chunk_checksum: str) -> bool:
         """
@@ -163,31 +358,46 @@ class ChunkedFileWriter:
         Args:
             offset: Byte offset in the file
             data: Chunk data
-            chunk_checksum: Expected MD5 of this chunk
+            chunk_checksum: Expected checksum of this chunk
 
         Returns:
             True if chunk was written successfully
         """
-        # Verify chunk checksum
-        actual_checksum = hashlib.md5(data).hexdigest()
-        if actual_checksum != chunk_checksum:
+        if not self.verify_chunk(offset, data, chunk_checksum):
+            return False
+        self.write_verified(offset, data)
+        return True
+
+    @staticmethod
+    def verify_chunk(offset: int, data: bytes, chunk_checksum: str) -> bool:
+        """Check a chunk against its checksum (touches no writer state)"""
+        if calculate_checksum_bytes(data) != chunk_checksum:
             logger.error(f"Chunk checksum mismatch at offset {offset}")
             return False
+        return True
+
+    def write_verified(self, offset: int, data: bytes):
+        """
+        Write a chunk that has already been verified.
 
+        Chunks written in file order are buffered into large writes; one
+        that doesn't continue from the previous chunk costs a seek and flush.
+        """
         with self._lock:
             self._ensure_file_open()
 
-            # Seek to offset (for out-of-order chunks or resume)
-            self._file.seek(offset)
+            # Seek only for out-of-order chunks or resume; seeking flushes the
+            # buffer, so contiguous chunks skip it and get written together
+            if offset != self._position:
+                self._file.seek(offset)
             self._file.write(data)
+            self._position = offset + len(data)
 
             # Update total bytes (track highest offset + size)
             end_pos = offset + len(data)
             if end_pos > self.bytes_written:
                 self.bytes_written = end_pos
 
-        return True
-
     def finalize(self) -> Path:
         """
         Close temp file, verify checksum, and move to final destination.
@@ -203,18 +413,17 @@ class ChunkedFileWriter:
                 self._file.close()
                 self._file = None
 
-        # Verify file size
+        # Verify file size. The file is preallocated to the expected size, so
+        # also check how far the written chunks actually reached.
         actual_size = self.temp_path.stat().st_size
+        if self.bytes_written != self.expected_size:
+            actual_size = self.bytes_written
         if actual_size != self.expected_size:
             self.cleanup()
             raise ValueError(f"Size mismatch: expected {self.expected_size}, got {actual_size}")
 
         # Verify full file checksum
-        hasher = hashlib.md5()
-        with open(self.temp_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(65536), b''):
-                hasher.update(chunk)
-        actual_checksum = hasher.hexdigest()
+        actual_checksum = calculate_checksum(self.temp_path)
 
         if actual_checksum != self.expected_checksum:
             self.cleanup()
@@ -264,6 +473,42 @@ class ChunkedFileWriter:
         return (self.bytes_written / self.expected_size) * 100
 
 
+class ProgressThrottle:
+    """
+    Decide which per-chunk progress updates are worth reporting.
+
+    Progress callbacks (UI, registry, checkpoints) cost far more than
+    receiving a small chunk. An update passes when interval seconds or
+    min_bytes of progress have gone by since the last one, and always for
+    the final chunk so observers see the end state.
+
+    Usage:
+        throttle = ProgressThrottle()
+        for chunk in chunks:
+            received += chunk.size
+            if throttle.should_report(received, final=chunk.is_last):
+                report(received)
+    """
+
+    def __init__(self, interval: float = 1 / 30, min_bytes: int = 1024 * 1024):
+        self.interval = interval
+        self.min_bytes = min_bytes
+        self._last_time: Optional[float] = None  # The first update always passes
+        self._last_bytes = 0
+
+    def should_report(self, total_bytes: int, final: bool = False) -> bool:
+        """Check (and record) whether progress at total_bytes should be reported"""
+        now = time.monotonic()
+        if (final
+                or self._last_time is None
+                or now - self._last_time >= self.interval
+                or total_bytes - self._last_bytes >= self.min_bytes):
+            self._last_time = now
+            self._last_bytes = total_bytes
+            return True
+        return False
+
+
 class ProgressTracker:
     """
     Track and display transfer progress.
@@ -402,7 +647,7 @@ def create_file_metadata(
     not the actual data.
     """
     import platform
-    from yank.common.protocol import FileInfo, TransferMetadata, calculate_checksum
+    from yank.common.protocol import FileInfo, TransferMetadata
 
     files_info = []
     total_size = 0
@@ -6,15 +6,17 @@ Uses AES-256-GCM for authenticated encryption.
 import os
 import hashlib
 import secrets
+import threading
+from functools import lru_cache
 from typing import Tuple
 
-# Use cryptography library if available, fallback to basic implementation
+# Use cryptography library if available. Without it, encrypt/decrypt raise and
+# the agent reports the backend as unavailable in its startup log.
 try:
     from cryptography.hazmat.primitives.ciphers.aead import AESGCM
     HAS_CRYPTOGRAPHY = True
 except ImportError:
     HAS_CRYPTOGRAPHY = False
-    print("WARNING: cryptography not installed. Run: pip install cryptography")
 
 
 # Constants
@@ -22,6 +24,12 @@ NONCE_SIZE = 12  # 96 bits for GCM
 TAG_SIZE = 16    # 128-bit authentication tag
 KEY_SIZE = 32    # 256-bit key
 
+# Nonces are sliced from one os.urandom block instead of a syscall per message
+_NONCE_BATCH = NONCE_SIZE * 512
+_nonce_lock = threading.Lock()
+_nonce_buf = b''
+_nonce_off = 0
+
 
 def derive_key(shared_secret: str, salt: bytes = None) -> Tuple[bytes, bytes]:
     """
@@ -54,6 +62,96 @@ def generate_key() -> bytes:
     return secrets.token_bytes(KEY_SIZE)
 
 
+@lru_cache(maxsize=8)
+def _cipher(key: bytes) -> "AESGCM":
+    """
+    AESGCM instance for a key, built once and reused.
+
+    Creating the instance (key validation and setup) costs more than
+    encrypting a small message such as a chunk ACK. Instances hold no
+    per-message state, so one can be shared across threads.
+    """
+    return AESGCM(key)
+
+
+def backend_info() -> str:
+    """
+    Describe the encryption backend after checking that it works.
+
+    Runs one AES-GCM round trip and reports the cryptography and OpenSSL
+    versions, since OpenSSL's build decides whether AES-NI is used.
+    """
+    if not HAS_CRYPTOGRAPHY:
+        return "unavailable - cryptography not installed. Run: pip install cryptography"
+
+    try:
+        cipher = AESGCM(bytes(KEY_SIZE))
+        nonce = bytes(NONCE_SIZE)
+        if cipher.decrypt(nonce, cipher.encrypt(nonce, b"self-test", None), None) != b"self-test":
+            return "AES-GCM self-test failed"
+    except Exception as e:
+        return f"AES-GCM self-test failed: {e}"
+
+    import cryptography
+    try:
+        from cryptography.hazmat.backends.openssl.backend import backend
+        openssl = backend.openssl_version_text()
+    except Exception:
+        openssl = "OpenSSL version unknown"
+    return f"cryptography {cryptography.__version__}, {openssl}"
+
+
+def _reset_nonces():
+    """Drop batched nonces, so a forked child never reuses its parent's"""
+    global _nonce_buf, _nonce_off
+    _nonce_buf = b''
+    _nonce_off = 0
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_nonces)
+
+
+def _next_nonce() -> bytes:
+    """
+    Random 96-bit GCM nonce.
+
+    Nonces stay fully random rather than counter-based: the pairing key
+    outlives restarts and is used by both peers, so a counter could repeat a
+    (key, nonce) pair, which breaks GCM. Only the os.urandom call is batched.
+    """
+    global _nonce_buf, _nonce_off
+    with _nonce_lock:
+        if _nonce_off + NONCE_SIZE > len(_nonce_buf):
+            _nonce_buf = os.urandom(_NONCE_BATCH)
+            _nonce_off = 0
+        nonce = _nonce_buf[_nonce_off:_nonce_off + NONCE_SIZE]
+        _nonce_off += NONCE_SIZE
+        return nonce
+
+
+def encrypt_parts(plaintext: bytes, key: bytes) -> Tuple[bytes, bytes]:
+    """
+    Encrypt data using AES-256-GCM, keeping the nonce separate
+
+    Callers that frame the result can write the nonce and ciphertext straight
+    into their output instead of joining them into an intermediate copy.
+
+    Args:
+        plaintext: Data to encrypt (any bytes-like object)
+        key: 32-byte encryption key
+
+    Returns:
+        (nonce (12 bytes), ciphertext + tag (16 bytes)) tuple
+    """
+    if not HAS_CRYPTOGRAPHY:
+        raise RuntimeError("cryptography library required for encryption. Run: pip install cryptography")
+
+    nonce = _next_nonce()
+    # Tag is appended by AESGCM
+    return nonce, _cipher(bytes(key)).encrypt(nonce, plaintext, None)
+
+
 def encrypt(plaintext: bytes, key: bytes) -> bytes:
     """
     Encrypt data using AES-256-GCM
@@ -65,14 +163,7 @@ def encrypt(plaintext: bytes, key: bytes) -> bytes:
     Returns:
         nonce (12 bytes) + ciphertext + tag (16 bytes)
     """
-    if not HAS_CRYPTOGRAPHY:
-        raise RuntimeError("cryptography library required for encryption")
-
-    nonce = os.urandom(NONCE_SIZE)
-    aesgcm = AESGCM(key)
-    ciphertext = aesgcm.encrypt(nonce, plaintext, None)
-
-    # Return nonce + ciphertext (tag is appended by AESGCM)
+    nonce, ciphertext = encrypt_parts(plaintext, key)
     return nonce + ciphertext
 
 
@@ -91,17 +182,18 @@ def decrypt(ciphertext: bytes, key: bytes) -> bytes:
         ValueError: If authentication fails (tampered data)
     """
     if not HAS_CRYPTOGRAPHY:
-        raise RuntimeError("cryptography library required for decryption")
+        raise RuntimeError("cryptography library required for decryption. Run: pip install cryptography")
 
     if len(ciphertext) < NONCE_SIZE + TAG_SIZE:
         raise ValueError("Ciphertext too short")
 
-    nonce = ciphertext[:NONCE_SIZE]
-    actual_ciphertext = ciphertext[NONCE_SIZE:]
+    # Slice through a view so the ciphertext isn't copied before decrypting
+    view = memoryview(ciphertext)
+    nonce = view[:NONCE_SIZE]
+    actual_ciphertext = view[NONCE_SIZE:]
 
-    aesgcm = AESGCM(key)
     try:
-        plaintext = aesgcm.decrypt(nonce, actual_ciphertext, None)
+        plaintext = _cipher(bytes(key)).decrypt(nonce, actual_ciphertext, None)
         return plaintext
     except Exception as e:
         raise ValueError(f"Decryption failed - data may be corrupted or tampered: {e}")
@@ -11,6 +11,7 @@ Features:
 - Auto-cleanup of expired transfers (TTL-based)
 - Transfer state management
 """
+import sys
 import time
 import threading
 import logging
@@ -23,6 +24,8 @@ from yank.common.protocol import TransferMetadata, FileInfo
 
 logger = logging.getLogger(__name__)
 
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 
 class TransferStatus(Enum):
     """Status of a transfer"""
@@ -36,7 +39,7 @@ class TransferStatus(Enum):
     EXPIRED = "expired"         # Transfer expired (TTL exceeded)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class TransferInfo:
     """Information about a transfer"""
     transfer_id: str
@@ -63,6 +66,9 @@ class TransferInfo:
     # Error info
     error_message: str = ""
 
+    # file_index -> FileInfo, built on first lookup
+    _files_by_index: Optional[Dict[int, FileInfo]] = field(default=None, init=False, repr=False)
+
     @property
     def is_expired(self) -> bool:
         """Check if transfer has expired"""
@@ -87,6 +93,12 @@ class TransferInfo:
         """Get source path for a file by index"""
         return self.source_paths.get(file_index)
 
+    def get_file_info(self, file_index: int) -> Optional[FileInfo]:
+        """Get file metadata by index"""
+        if self._files_by_index is None:
+            self._files_by_index = {f.file_index: f for f in self.metadata.files}
+        return self._files_by_index.get(file_index)
+
 
 class FileRegistry:
     """
@@ -104,38 +116,33 @@ class FileRegistry:
         self._transfers: Dict[str, TransferInfo] = {}
         self._lock = threading.RLock()
         self._cleanup_interval = cleanup_interval
-        self._cleanup_timer: Optional[threading.Timer] = None
+        self._stop_event = threading.Event()
         self._callbacks: Dict[str, List[Callable]] = {
             'on_expired': [],
             'on_transfer_complete': [],
         }
 
-        # Start cleanup timer
-        self._schedule_cleanup()
-
-    def _schedule_cleanup(self):
-        """Schedule the next cleanup"""
-        if self._cleanup_timer:
-            self._cleanup_timer.cancel()
-
-        self._cleanup_timer = threading.Timer(self._cleanup_interval, self._do_cleanup)
-        self._cleanup_timer.daemon = True
-        self._cleanup_timer.start()
-
-    def _do_cleanup(self):
-        """Perform cleanup of expired transfers"""
-        try:
-            self.cleanup_expired()
-        except Exception as e:
-            logger.error(f"Cleanup error: {e}")
-        finally:
-            self._schedule_cleanup()
+        # One long-lived cleanup thread, woken every cleanup_interval
+        self._cleanup_thread = threading.Thread(
+            target=self._cleanup_loop,
+            name='yank-registry-cleanup',
+            daemon=True
+        )
+        self._cleanup_thread.start()
+
+    def _cleanup_loop(self):
+        """Clean up expired transfers every cleanup_interval until stopped"""
+        while not self._stop_event.wait(self._cleanup_interval):
+            try:
+                self.cleanup_expired()
+            except Exception as e:
+                logger.error(f"Cleanup error: {e}")
 
     def stop(self):
-        """Stop the cleanup timer"""
-        if self._cleanup_timer:
-            self._cleanup_timer.cancel()
-            self._cleanup_timer = None
+        """Stop the cleanup thread"""
+        self._stop_event.set()
+        if self._cleanup_thread is not threading.current_thread():
+            self._cleanup_thread.join(timeout=1.0)
 
     def register_callback(self, event: str, callback: Callable):
         """Register a callback for an event"""
@@ -169,23 +176,27 @@ class FileRegistry:
         Returns:
             TransferInfo for the registered transfer
         """
-        with self._lock:
-            # Build file_index -> path mapping
-            source_paths = {}
-            for i, path in enumerate(file_paths):
-                path = Path(path)
-                if path.is_dir():
-                    # For directories, map each file inside
-                    for j, file_info in enumerate(metadata.files):
-                        if file_info.file_index >= i:
-                            # Find matching file in directory
-                            rel_path = file_info.relative_path
-                            full_path = path.parent / rel_path
-                            if full_path.exists():
-                                source_paths[file_info.file_index] = full_path
-                else:
-                    source_paths[i] = path
+        # Build file_index -> path mapping. Files inside directories are
+        # matched by relative path, found with one walk per directory; plain
+        # files take the next index, as in create_file_metadata.
+        index_by_rel = {f.relative_path: f.file_index for f in metadata.files}
+        source_paths = {}
+        next_index = 0
+        for path in file_paths:
+            path = Path(path)
+            if path.is_dir():
+                for subpath in path.rglob('*'):
+                    if not subpath.is_file():
+                        continue
+                    file_index = index_by_rel.get(str(subpath.relative_to(path.parent)))
+                    if file_index is not None:
+                        source_paths[file_index] = subpath
+                        next_index = max(next_index, file_index + 1)
+            else:
+                source_paths[next_index] = path
+                next_index += 1
 
+        with self._lock:
             info = TransferInfo(
                 transfer_id=transfer_id,
                 metadata=metadata,
@@ -274,16 +285,28 @@ class FileRegistry:
         file_index: int = None,
         chunk_index: int = None
     ):
-        """Update transfer progress"""
-        with self._lock:
-            info = self._transfers.get(transfer_id)
-            if info:
-                info.bytes_transferred = bytes_transferred
-                info.status = TransferStatus.TRANSFERRING
-                if file_index is not None:
-                    info.current_file_index = file_index
-                if chunk_index is not None:
-                    info.current_chunk_index = chunk_index
+        """
+        Update transfer progress
+
+        The counters are plain attribute stores on the transfer's own
+        TransferInfo, so they're written without the registry lock; it's only
+        taken for the first move to TRANSFERRING. A transfer that has already
+        finished or been cancelled keeps its status.
+        """
+        info = self._transfers.get(transfer_id)
+        if not info:
+            return
+
+        info.bytes_transferred = bytes_transferred
+        if file_index is not None:
+            info.current_file_index = file_index
+        if chunk_index is not None:
+            info.current_chunk_index = chunk_index
+
+        if info.status is not TransferStatus.TRANSFERRING:
+            with self._lock:
+                if not info.is_complete:
+                    info.status = TransferStatus.TRANSFERRING
 
     def add_downloaded_file(self, transfer_id: str, file_path: Path):
         """Record a completed file download"""
@@ -299,9 +322,12 @@ class FileRegistry:
             if info:
                 info.status = TransferStatus.COMPLETED
                 info.completed_at = time.time()
-                self._fire_callbacks('on_transfer_complete', info)
-                logger.info(f"Transfer completed: {transfer_id}")
-            return info
+
+        # Callbacks run without the lock so they can't stall other registry calls
+        if info:
+            self._fire_callbacks('on_transfer_complete', info)
+            logger.info(f"Transfer completed: {transfer_id}")
+        return info
 
     def fail_transfer(self, transfer_id: str, error: str) -> Optional[TransferInfo]:
         """Mark a transfer as failed"""
@@ -373,18 +399,19 @@ class FileRegistry:
             Number of transfers cleaned up
         """
         with self._lock:
-            expired_ids = []
+            expired = []
 
-            for transfer_id, info in self._transfers.items():
+            for info in self._transfers.values():
                 if info.is_expired and not info.is_complete:
                     info.status = TransferStatus.EXPIRED
-                    expired_ids.append(transfer_id)
-                    self._fire_callbacks('on_expired', info)
+                    expired.append(info)
 
-            for transfer_id in expired_ids:
-                logger.info(f"Transfer expired: {transfer_id}")
+        # Callbacks run without the lock so they can't stall other registry calls
+        for info in expired:
+            logger.info(f"Transfer expired: {info.transfer_id}")
+            self._fire_callbacks('on_expired', info)
 
-            return len(expired_ids)
+        return len(expired)
 
     def cleanup_completed(self, max_age: int = 3600) -> int:
         """
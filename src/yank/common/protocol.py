@@ -13,14 +13,17 @@ Message Format (encrypted):
 │ Total Length │ ENCRYPTED    │ (nonce + ciphertext + tag)       │
 └──────────────┴──────────────┴──────────────────────────────────┘
 """
+import os
+import sys
 import json
 import struct
 import hashlib
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, asdict
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, Optional, Union
 from pathlib import Path
-import io
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +31,19 @@ logger = logging.getLogger(__name__)
 MAX_MESSAGE_SIZE = 10 * 1024 * 1024 + 1024  # 10MB + overhead for message content
 MAX_BUFFER_SIZE = 20 * 1024 * 1024  # 20MB max buffer to prevent memory exhaustion
 
+# Hash used for file and chunk checksums on the wire. OpenSSL runs SHA-256 on
+# the CPU's SHA extensions where available, which outpaces scalar MD5.
+CHECKSUM_ALGORITHM = 'sha256'
+_HASH_BLOCK_SIZE = 1024 * 1024  # Read size when hashing files without hashlib.file_digest
+_HASH_WORKERS = min(8, os.cpu_count() or 1)  # Files hashed at once by collect_files/pack_files
+
+# Frame header: 4-byte big-endian length, then the type (or ENCRYPTED flag) byte
+_FRAME_HEADER = struct.Struct('>IB')
+_LENGTH = struct.Struct('>I')
+
+# FileInfo/ChunkInfo are made per file and per chunk; slots drop their __dict__
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 
 class MessageType:
     """Message types for the protocol"""
@@ -61,12 +77,12 @@ class MessageFlags:
     ENCRYPTED = 0x01  # Payload is encrypted
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class FileInfo:
     """Metadata for a single file"""
     name: str
     size: int
-    checksum: str  # MD5 for quick verification
+    checksum: str  # CHECKSUM_ALGORITHM digest for verification
     is_directory: bool = False
     relative_path: str = ""  # For preserving folder structure
     file_index: int = 0  # Index in the transfer (for multi-file)
@@ -82,7 +98,7 @@ class FileInfo:
         return cls(**data)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ChunkInfo:
     """Metadata for a file chunk"""
     transfer_id: str
@@ -90,7 +106,7 @@ class ChunkInfo:
     chunk_index: int  # Which chunk of the file
     offset: int  # Byte offset in file
     size: int  # Size of this chunk
-    checksum: str  # MD5 of this chunk
+    checksum: str  # Checksum (CHECKSUM_ALGORITHM) of this chunk
     is_last: bool = False  # Last chunk of the file
 
     def to_dict(self):
@@ -121,7 +137,7 @@ class TransferProgress:
         return cls(**data)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class TransferMetadata:
     """Metadata for a clipboard transfer"""
     files: List[FileInfo]
@@ -157,17 +173,52 @@ class TransferMetadata:
 
 
 def calculate_checksum(filepath: Path) -> str:
-    """Calculate MD5 checksum of a file"""
-    hasher = hashlib.md5()
-    with open(filepath, 'rb') as f:
-        for chunk in iter(lambda: f.read(65536), b''):
-            hasher.update(chunk)
+    """
+    Calculate the CHECKSUM_ALGORITHM checksum of a file
+
+    Uses hashlib.file_digest (Python 3.11+), which hashes straight from the
+    file's buffer inside OpenSSL; older Pythons read into one reused buffer.
+    The file is opened unbuffered since both read in large blocks anyway.
+    """
+    with open(filepath, 'rb', buffering=0) as f:
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, CHECKSUM_ALGORITHM).hexdigest()
+
+        hasher = new_checksum()
+        buf = bytearray(_HASH_BLOCK_SIZE)
+        view = memoryview(buf)
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            hasher.update(view[:n])
     return hasher.hexdigest()
 
 
-def calculate_checksum_bytes(data: bytes) -> str:
-    """Calculate MD5 checksum of bytes"""
-    return hashlib.md5(data).hexdigest()
+def new_checksum():
+    """Incremental hasher for CHECKSUM_ALGORITHM"""
+    return hashlib.new(CHECKSUM_ALGORITHM)
+
+
+def calculate_checksum_bytes(data: Union[bytes, bytearray, memoryview]) -> str:
+    """Calculate the CHECKSUM_ALGORITHM checksum of bytes"""
+    return hashlib.new(CHECKSUM_ALGORITHM, data).hexdigest()
+
+
+@lru_cache(maxsize=64)
+def _file_chunk_ack_prefix(transfer_id: str, file_index: int) -> bytes:
+    """JSON of a FILE_CHUNK_ACK up to its chunk_index value"""
+    ack_json = json.dumps({
+        'transfer_id': transfer_id,
+        'file_index': file_index,
+        'chunk_index': 0
+    })
+    return ack_json[:-2].encode('utf-8')
+
+
+def _frame(msg_type: int, *parts) -> bytes:
+    """Join a length prefix, type byte and payload parts into one frame"""
+    return b''.join((_FRAME_HEADER.pack(1 + sum(map(len, parts)), msg_type),) + parts)
 
 
 class MessageBuilder:
@@ -176,26 +227,24 @@ class MessageBuilder:
     @staticmethod
     def _encrypt_message(message: bytes, key: bytes) -> bytes:
         """Encrypt a message and wrap with encrypted header"""
-        from yank.common.crypto import encrypt
+        from yank.common.crypto import encrypt_parts
 
         # Original message is: [4 bytes len][1 byte type][payload]
         # We encrypt everything after the length header
-
-        original_len = struct.unpack('>I', message[:4])[0]
-        content = message[4:]  # type + payload
+        content = memoryview(message)[4:]  # type + payload
 
         # Encrypt content
-        encrypted = encrypt(content, key)
+        nonce, ciphertext = encrypt_parts(content, key)
 
-        # Build new message with encrypted flag
-        # Format: [4 bytes len][1 byte ENCRYPTED flag][encrypted data]
-        new_content = bytes([MessageFlags.ENCRYPTED]) + encrypted
-        return struct.pack('>I', len(new_content)) + new_content
+        # Build new message with encrypted flag, joining the pieces in one copy
+        # Format: [4 bytes len][1 byte ENCRYPTED flag][nonce][ciphertext + tag]
+        header = _FRAME_HEADER.pack(1 + len(nonce) + len(ciphertext), MessageFlags.ENCRYPTED)
+        return b''.join((header, nonce, ciphertext))
 
     @staticmethod
     def build_ping(key: bytes = None) -> bytes:
         """Build a ping message"""
-        message = struct.pack('>IB', 1, MessageType.PING)
+        message = _FRAME_HEADER.pack(1, MessageType.PING)
         if key:
             return MessageBuilder._encrypt_message(message, key)
         return message
@@ -203,7 +252,7 @@ class MessageBuilder:
     @staticmethod
     def build_pong(key: bytes = None) -> bytes:
         """Build a pong message"""
-        message = struct.pack('>IB', 1, MessageType.PONG)
+        message = _FRAME_HEADER.pack(1, MessageType.PONG)
         if key:
             return MessageBuilder._encrypt_message(message, key)
         return message
@@ -221,26 +270,36 @@ class MessageBuilder:
         - M bytes: file data
         """
         metadata_json = json.dumps(metadata.to_dict()).encode('utf-8')
-        metadata_len = len(metadata_json)
-
-        # Message content (excluding the 4-byte length header)
-        content = struct.pack('>BI', MessageType.FILE_TRANSFER, metadata_len)
-        content += metadata_json
-        content += file_data
-
-        # Prepend total length
-        message = struct.pack('>I', len(content)) + content
+        message = _frame(
+            MessageType.FILE_TRANSFER, _LENGTH.pack(len(metadata_json)), metadata_json, file_data
+        )
 
         if key:
             return MessageBuilder._encrypt_message(message, key)
         return message
 
+    @staticmethod
+    def build_file_transfer_header(metadata: TransferMetadata) -> bytes:
+        """
+        Build the leading part of an unencrypted file transfer message
+
+        The length prefix covers metadata.total_size bytes of file data, which
+        the caller sends straight after this header (e.g. with socket.sendfile)
+        so the packed payload never has to be assembled in memory.
+        """
+        metadata_json = json.dumps(metadata.to_dict()).encode('utf-8')
+        length = 5 + len(metadata_json) + metadata.total_size
+        return b''.join((
+            _FRAME_HEADER.pack(length, MessageType.FILE_TRANSFER),
+            _LENGTH.pack(len(metadata_json)),
+            metadata_json
+        ))
+
     @staticmethod
     def build_ack(success: bool, message: str = "", key: bytes = None) -> bytes:
         """Build an acknowledgment message"""
         ack_data = json.dumps({'success': success, 'message': message}).encode('utf-8')
-        content = struct.pack('>B', MessageType.FILE_ACK) + ack_data
-        msg = struct.pack('>I', len(content)) + content
+        msg = _frame(MessageType.FILE_ACK, ack_data)
 
         if key:
             return MessageBuilder._encrypt_message(msg, key)
@@ -249,9 +308,7 @@ class MessageBuilder:
     @staticmethod
     def build_error(error_message: str, key: bytes = None) -> bytes:
         """Build an error message"""
-        error_data = error_message.encode('utf-8')
-        content = struct.pack('>B', MessageType.ERROR) + error_data
-        msg = struct.pack('>I', len(content)) + content
+        msg = _frame(MessageType.ERROR, error_message.encode('utf-8'))
 
         if key:
             return MessageBuilder._encrypt_message(msg, key)
@@ -260,26 +317,22 @@ class MessageBuilder:
     @staticmethod
     def build_auth_challenge(challenge: bytes) -> bytes:
         """Build an authentication challenge message"""
-        content = struct.pack('>B', MessageType.AUTH_CHALLENGE) + challenge
-        return struct.pack('>I', len(content)) + content
+        return _frame(MessageType.AUTH_CHALLENGE, challenge)
 
     @staticmethod
     def build_auth_response(response: bytes) -> bytes:
         """Build an authentication response message"""
-        content = struct.pack('>B', MessageType.AUTH_RESPONSE) + response
-        return struct.pack('>I', len(content)) + content
+        return _frame(MessageType.AUTH_RESPONSE, response)
 
     @staticmethod
     def build_auth_success() -> bytes:
         """Build an authentication success message"""
-        return struct.pack('>IB', 1, MessageType.AUTH_SUCCESS)
+        return _FRAME_HEADER.pack(1, MessageType.AUTH_SUCCESS)
 
     @staticmethod
     def build_auth_failure(reason: str = "") -> bytes:
         """Build an authentication failure message"""
-        reason_data = reason.encode('utf-8')
-        content = struct.pack('>B', MessageType.AUTH_FAILURE) + reason_data
-        return struct.pack('>I', len(content)) + content
+        return _frame(MessageType.AUTH_FAILURE, reason.encode('utf-8'))
 
     @staticmethod
     def build_text_transfer(text: str, key: bytes = None) -> bytes:
@@ -293,10 +346,7 @@ class MessageBuilder:
         - N bytes: text data (UTF-8)
         """
         text_data = text.encode('utf-8')
-        content = struct.pack('>BI', MessageType.TEXT_TRANSFER, len(text_data))
-        content += text_data
-
-        message = struct.pack('>I', len(content)) + content
+        message = _frame(MessageType.TEXT_TRANSFER, _LENGTH.pack(len(text_data)), text_data)
 
         if key:
             return MessageBuilder._encrypt_message(message, key)
@@ -306,8 +356,7 @@ class MessageBuilder:
     def build_text_ack(success: bool, message: str = "", key: bytes = None) -> bytes:
         """Build a text acknowledgment message"""
         ack_data = json.dumps({'success': success, 'message': message}).encode('utf-8')
-        content = struct.pack('>B', MessageType.TEXT_ACK) + ack_data
-        msg = struct.pack('>I', len(content)) + content
+        msg = _frame(MessageType.TEXT_ACK, ack_data)
 
         if key:
             return MessageBuilder._encrypt_message(msg, key)
@@ -326,8 +375,7 @@ class MessageBuilder:
         - N bytes: metadata JSON
         """
         metadata_json = json.dumps(metadata.to_dict()).encode('utf-8')
-        content = struct.pack('>B', MessageType.FILE_ANNOUNCE) + metadata_json
-        message = struct.pack('>I', len(content)) + content
+        message = _frame(MessageType.FILE_ANNOUNCE, metadata_json)
 
         if key:
             return MessageBuilder._encrypt_message(message, key)
@@ -348,8 +396,7 @@ class MessageBuilder:
             'file_index': file_index,
             'offset': offset  # For resume support
         }).encode('utf-8')
-        content = struct.pack('>B', MessageType.FILE_REQUEST) + request_data
-        message = struct.pack('>I', len(content)) + content
+        message = _frame(MessageType.FILE_REQUEST, request_data)
 
         if key:
             return MessageBuilder._encrypt_message(message, key)
@@ -368,25 +415,34 @@ class MessageBuilder:
         - M bytes: chunk data
         """
         chunk_json = json.dumps(chunk_info.to_dict()).encode('utf-8')
-        content = struct.pack('>BI', MessageType.FILE_CHUNK, len(chunk_json))
-        content += chunk_json
-        content += data
-        message = struct.pack('>I', len(content)) + content
+        message = _frame(MessageType.FILE_CHUNK, _LENGTH.pack(len(chunk_json)), chunk_json, data)
 
         if key:
             return MessageBuilder._encrypt_message(message, key)
         return message
 
+    @staticmethod
+    def build_file_chunk_header(chunk_info: 'ChunkInfo') -> bytes:
+        """
+        Build an unencrypted file chunk message without its chunk data.
+
+        The caller must follow this with exactly chunk_info.size bytes of chunk
+        data, which lets the data be streamed straight from disk (sendfile).
+        """
+        chunk_json = json.dumps(chunk_info.to_dict()).encode('utf-8')
+        length = 5 + len(chunk_json) + chunk_info.size
+        return b''.join((
+            _FRAME_HEADER.pack(length, MessageType.FILE_CHUNK),
+            _LENGTH.pack(len(chunk_json)),
+            chunk_json
+        ))
+
     @staticmethod
     def build_file_chunk_ack(transfer_id: str, file_index: int, chunk_index: int, key: bytes = None) -> bytes:
         """Build a chunk acknowledgment message"""
-        ack_data = json.dumps({
-            'transfer_id': transfer_id,
-            'file_index': file_index,
-            'chunk_index': chunk_index
-        }).encode('utf-8')
-        content = struct.pack('>B', MessageType.FILE_CHUNK_ACK) + ack_data
-        message = struct.pack('>I', len(content)) + content
+        # Only chunk_index changes between the ACKs of one file
+        prefix = _file_chunk_ack_prefix(transfer_id, file_index)
+        message = _frame(MessageType.FILE_CHUNK_ACK, prefix, b'%d}' % chunk_index)
 
         if key:
             return MessageBuilder._encrypt_message(message, key)
@@ -396,8 +452,7 @@ class MessageBuilder:
     def build_transfer_complete(transfer_id: str, key: bytes = None) -> bytes:
         """Build a transfer complete message"""
         data = json.dumps({'transfer_id': transfer_id}).encode('utf-8')
-        content = struct.pack('>B', MessageType.TRANSFER_COMPLETE) + data
-        message = struct.pack('>I', len(content)) + content
+        message = _frame(MessageType.TRANSFER_COMPLETE, data)
 
         if key:
             return MessageBuilder._encrypt_message(message, key)
@@ -410,8 +465,7 @@ class MessageBuilder:
             'transfer_id': transfer_id,
             'reason': reason
         }).encode('utf-8')
-        content = struct.pack('>B', MessageType.TRANSFER_CANCEL) + data
-        message = struct.pack('>I', len(content)) + content
+        message = _frame(MessageType.TRANSFER_CANCEL, data)
 
         if key:
             return MessageBuilder._encrypt_message(message, key)
@@ -424,8 +478,7 @@ class MessageBuilder:
             'transfer_id': transfer_id,
             'error': error
         }).encode('utf-8')
-        content = struct.pack('>B', MessageType.TRANSFER_ERROR) + data
-        message = struct.pack('>I', len(content)) + content
+        message = _frame(MessageType.TRANSFER_ERROR, data)
 
         if key:
             return MessageBuilder._encrypt_message(message, key)
@@ -457,30 +510,80 @@ def _safe_json_parse(data: bytes, expected_keys: list = None) -> tuple:
 
 
 class MessageParser:
-    """Parse protocol messages"""
+    """
+    Parse protocol messages
+
+    Received bytes accumulate in one bytearray. Parsed frames are consumed by
+    advancing a read offset rather than deleting them from the front, which
+    would shift the rest of the buffer on every frame; the consumed prefix is
+    dropped in one go once it makes up most of the buffer.
+    """
 
     def __init__(self, key: bytes = None):
-        self.buffer = bytearray()
+        self._buf = bytearray()
+        self._start = 0  # Offset of the first unconsumed byte in _buf
         self.key = key  # Encryption key for decryption
 
+    @property
+    def buffer(self) -> bytes:
+        """Copy of the buffered bytes not yet parsed (for inspection)"""
+        return self._copy_out(self._start, len(self._buf))
+
+    @property
+    def buffered(self) -> int:
+        """Number of buffered bytes not yet parsed"""
+        return len(self._buf) - self._start
+
     def set_key(self, key: bytes):
         """Set the encryption key for decryption"""
         self.key = key
 
-    def feed(self, data: bytes) -> bool:
+    def _clear(self):
+        self._buf.clear()
+        self._start = 0
+
+    def _consume(self, n: int):
+        """Mark n bytes as parsed"""
+        self._start += n
+        if self._start == len(self._buf):
+            self._clear()
+
+    def feed(self, data: Union[bytes, bytearray, memoryview]) -> bool:
         """
         Feed data into the parser buffer.
 
+        Any buffer-protocol object is accepted, so callers can pass a view of a
+        reused receive buffer; its bytes are copied in once.
+
         Returns:
             True if data was accepted, False if buffer overflow would occur
         """
-        if len(self.buffer) + len(data) > MAX_BUFFER_SIZE:
-            logger.error(f"Buffer overflow prevented: {len(self.buffer)} + {len(data)} > {MAX_BUFFER_SIZE}")
-            self.buffer.clear()
+        buffered = self.buffered
+        if buffered + len(data) > MAX_BUFFER_SIZE:
+            logger.error(f"Buffer overflow prevented: {buffered} + {len(data)} > {MAX_BUFFER_SIZE}")
+            self._clear()
             return False
-        self.buffer.extend(data)
+
+        # Drop the parsed prefix once it outweighs what's left, so the
+        # shift is amortised over many frames
+        if self._start and self._start >= buffered:
+            del self._buf[:self._start]
+            self._start = 0
+
+        self._buf.extend(data)
         return True
 
+    def _copy_out(self, start: int, end: int) -> bytes:
+        """
+        Copy _buf[start:end] into a new bytes object in a single copy.
+
+        Slicing the bytearray directly would first build an intermediate
+        bytearray and then copy that again. The view is released before
+        returning so the buffer can still be resized afterwards.
+        """
+        with memoryview(self._buf) as view:
+            return bytes(view[start:end])
+
     def parse_one(self) -> Optional[tuple]:
         """
         Try to parse one complete message from buffer
@@ -488,39 +591,39 @@ class MessageParser:
         Returns: (message_type, payload) or None if incomplete
         """
         # Need at least 5 bytes (4 length + 1 type/flag)
-        if len(self.buffer) < 5:
+        start = self._start
+        buffered = len(self._buf) - start
+        if buffered < 5:
             return None
 
-        # Read message length
-        msg_len = struct.unpack('>I', self.buffer[:4])[0]
+        # Read message length and type/flag in one go, without slicing the buffer
+        msg_len, first_byte = _FRAME_HEADER.unpack_from(self._buf, start)
 
         # Validate message length to prevent DoS
         if msg_len > MAX_MESSAGE_SIZE:
             logger.error(f"Message too large: {msg_len} bytes (max: {MAX_MESSAGE_SIZE})")
-            self.buffer.clear()
+            self._clear()
             return (MessageType.ERROR, b"Message exceeds maximum size")
 
         # Check if we have the full message
         total_needed = 4 + msg_len
-        if len(self.buffer) < total_needed:
+        if buffered < total_needed:
             return None
 
         # Check if encrypted
-        first_byte = self.buffer[4]
-
         if first_byte == MessageFlags.ENCRYPTED:
             # Check for encryption key BEFORE consuming buffer
             if not self.key:
                 logger.warning("Received encrypted message but no key set")
                 # Still consume the message to avoid buffer buildup
-                del self.buffer[:total_needed]
+                self._consume(total_needed)
                 return (MessageType.ERROR, b"No encryption key")
 
             # Encrypted message
-            encrypted_data = bytes(self.buffer[5:total_needed])
+            encrypted_data = self._copy_out(start + 5, start + total_needed)
 
             # Remove from buffer
-            del self.buffer[:total_needed]
+            self._consume(total_needed)
 
             try:
                 from yank.common.crypto import decrypt
@@ -539,10 +642,10 @@ class MessageParser:
         else:
             # Unencrypted message
             msg_type = first_byte
-            payload = bytes(self.buffer[5:total_needed])
+            payload = self._copy_out(start + 5, start + total_needed)
 
             # Remove from buffer
-            del self.buffer[:total_needed]
+            self._consume(total_needed)
 
             return (msg_type, payload)
     
@@ -551,11 +654,11 @@ class MessageParser:
         """
         Parse a file transfer payload
 
-        Returns: (TransferMetadata, file_data)
+        Returns: (TransferMetadata, file_data) - file_data is a memoryview into payload
         Raises: ValueError if parsing fails
         """
         # First 4 bytes are metadata length
-        metadata_len = struct.unpack('>I', payload[:4])[0]
+        metadata_len = _LENGTH.unpack_from(payload)[0]
 
         # Extract metadata JSON
         success, result = _safe_json_parse(payload[4:4+metadata_len])
@@ -563,8 +666,8 @@ class MessageParser:
             raise ValueError(f"Failed to parse file transfer metadata: {result}")
         metadata = TransferMetadata.from_dict(result)
 
-        # Rest is file data
-        file_data = payload[4+metadata_len:]
+        # Rest is file data - a zero-copy view, since it is most of the message
+        file_data = memoryview(payload)[4+metadata_len:]
 
         return (metadata, file_data)
 
@@ -593,7 +696,7 @@ class MessageParser:
         Raises: ValueError if parsing fails
         """
         # First 4 bytes are text length
-        text_len = struct.unpack('>I', payload[:4])[0]
+        text_len = _LENGTH.unpack_from(payload)[0]
         text_data = payload[4:4 + text_len]
         try:
             return text_data.decode('utf-8')
@@ -631,11 +734,11 @@ class MessageParser:
         """
         Parse a file chunk payload
 
-        Returns: (ChunkInfo, chunk_data)
+        Returns: (ChunkInfo, chunk_data) - chunk_data is a memoryview into payload
         Raises: ValueError if parsing fails
         """
         # First 4 bytes are chunk info JSON length
-        chunk_info_len = struct.unpack('>I', payload[:4])[0]
+        chunk_info_len = _LENGTH.unpack_from(payload)[0]
 
         # Extract chunk info JSON
         success, result = _safe_json_parse(payload[4:4 + chunk_info_len])
@@ -643,8 +746,8 @@ class MessageParser:
             raise ValueError(f"Failed to parse chunk info: {result}")
         chunk_info = ChunkInfo.from_dict(result)
 
-        # Rest is chunk data
-        chunk_data = payload[4 + chunk_info_len:]
+        # Rest is chunk data - a zero-copy view, since it is most of the message
+        chunk_data = memoryview(payload)[4 + chunk_info_len:]
 
         return (chunk_info, chunk_data)
 
@@ -681,82 +784,156 @@ class MessageParser:
         return result
 
 
-def pack_files(file_paths: List[Path], base_path: Optional[Path] = None) -> tuple:
+def _iter_sources(file_paths: List[Path], base_path: Optional[Path] = None):
     """
-    Pack multiple files into a single binary blob with metadata
-    
-    Returns: (TransferMetadata, packed_bytes)
+    Expand file_paths to (path, relative_path) pairs in transfer order
+
+    Directories are expanded to the files they contain.
     """
-    import time
-    import platform
-    
-    files_info = []
-    data_stream = io.BytesIO()
-    total_size = 0
-    
     for filepath in file_paths:
         filepath = Path(filepath)
-        
+
         if filepath.is_dir():
             # For directories, we'll pack all contents
             for subpath in filepath.rglob('*'):
                 if subpath.is_file():
-                    rel_path = subpath.relative_to(filepath.parent)
-                    file_size = subpath.stat().st_size
-                    checksum = calculate_checksum(subpath)
-                    
-                    files_info.append(FileInfo(
-                        name=subpath.name,
-                        size=file_size,
-                        checksum=checksum,
-                        is_directory=False,
-                        relative_path=str(rel_path)
-                    ))
-                    
-                    with open(subpath, 'rb') as f:
-                        data_stream.write(f.read())
-                    total_size += file_size
+                    yield subpath, str(subpath.relative_to(filepath.parent))
         else:
             # Single file
-            file_size = filepath.stat().st_size
-            checksum = calculate_checksum(filepath)
-            
             rel_path = filepath.name
             if base_path:
                 rel_path = str(filepath.relative_to(base_path))
-            
-            files_info.append(FileInfo(
-                name=filepath.name,
-                size=file_size,
-                checksum=checksum,
-                is_directory=False,
-                relative_path=rel_path
-            ))
-            
-            with open(filepath, 'rb') as f:
-                data_stream.write(f.read())
-            total_size += file_size
-    
-    metadata = TransferMetadata(
+            yield filepath, rel_path
+
+
+def _map_files(func, paths: List[Path]) -> list:
+    """
+    Apply func to each path, in order, on a thread pool when there are several
+
+    hashlib and file reads release the GIL, so files hash and load in parallel.
+    """
+    if len(paths) < 2 or _HASH_WORKERS < 2:
+        return [func(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=min(_HASH_WORKERS, len(paths)),
+                            thread_name_prefix='yank-hash') as pool:
+        return list(pool.map(func, paths))
+
+
+def _read_and_hash(path: Path) -> tuple:
+    """Read a whole file; returns (data, checksum)"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return data, calculate_checksum_bytes(data)
+
+
+def _transfer_metadata(files_info: List[FileInfo], total_size: int) -> TransferMetadata:
+    """Wrap collected FileInfos in TransferMetadata for this host"""
+    import time
+    import platform
+
+    return TransferMetadata(
         files=files_info,
         total_size=total_size,
         timestamp=time.time(),
         source_os='windows' if platform.system() == 'Windows' else 'macos'
     )
-    
-    return (metadata, data_stream.getvalue())
 
 
-def unpack_files(metadata: TransferMetadata, data: bytes, dest_dir: Path) -> List[Path]:
+def collect_files(file_paths: List[Path], base_path: Optional[Path] = None) -> tuple:
+    """
+    Build transfer metadata for files without reading them into memory
+
+    Directories are expanded to the files they contain, and files are hashed
+    in parallel. The returned source paths are in the same order as
+    metadata.files, which is the order their data appears in a packed payload.
+
+    Returns: (TransferMetadata, list of source file paths)
+    """
+    sources = list(_iter_sources(file_paths, base_path))
+    paths = [path for path, _ in sources]
+    checksums = _map_files(calculate_checksum, paths)
+
+    files_info = []
+    total_size = 0
+    for (path, rel_path), checksum in zip(sources, checksums):
+        file_size = path.stat().st_size
+        files_info.append(FileInfo(
+            name=path.name,
+            size=file_size,
+            checksum=checksum,
+            is_directory=False,
+            relative_path=rel_path
+        ))
+        total_size += file_size
+
+    return (_transfer_metadata(files_info, total_size), paths)
+
+
+def pack_files(file_paths: List[Path], base_path: Optional[Path] = None) -> tuple:
+    """
+    Pack multiple files into a single binary blob with metadata
+
+    Each file is read once, in parallel with the others; its checksum is taken
+    from the bytes being packed.
+
+    Returns: (TransferMetadata, packed_bytes)
+    """
+    sources = list(_iter_sources(file_paths, base_path))
+    loaded = _map_files(_read_and_hash, [path for path, _ in sources])
+
+    files_info = []
+    parts = []
+    total_size = 0
+    for (path, rel_path), (data, checksum) in zip(sources, loaded):
+        files_info.append(FileInfo(
+            name=path.name,
+            size=len(data),
+            checksum=checksum,
+            is_directory=False,
+            relative_path=rel_path
+        ))
+        parts.append(data)
+        total_size += len(data)
+
+    return (_transfer_metadata(files_info, total_size), b''.join(parts))
+
+
+def _create_unique(path: Path, next_suffix: dict):
+    """
+    Exclusively create path, or on a name collision the first free stem_N.suffix
+
+    next_suffix remembers where each name left off, so later files with the
+    same name start past the ones already claimed. Returns (file, path).
+    """
+    stem, suffix = path.stem, path.suffix
+    key = (path.parent, stem, suffix)
+    counter = next_suffix.get(key, 0)
+    while True:
+        candidate = path if counter == 0 else path.parent / f"{stem}_{counter}{suffix}"
+        try:
+            f = open(candidate, 'xb')
+        except FileExistsError:
+            counter += 1
+            continue
+        next_suffix[key] = counter + 1
+        return f, candidate
+
+
+def unpack_files(metadata: TransferMetadata, data: Union[bytes, memoryview], dest_dir: Path) -> List[Path]:
     """
     Unpack files from binary blob to destination directory
-    
+
+    Each file is hashed and written in one pass over zero-copy views of data,
+    block by block; a file whose checksum doesn't match is removed again.
+
     Returns: List of extracted file paths
     """
     dest_dir = Path(dest_dir)
     dest_dir.mkdir(parents=True, exist_ok=True)
     
     extracted_paths = []
+    next_suffix = {}
+    view = memoryview(data)
     offset = 0
     
     for file_info in metadata.files:
@@ -767,28 +944,24 @@ def unpack_files(metadata: TransferMetadata, data: bytes, dest_dir: Path) -> Lis
         else:
             dest_path = dest_dir / file_info.name
         
-        # Handle name collisions
-        if dest_path.exists():
-            stem = dest_path.stem
-            suffix = dest_path.suffix
-            counter = 1
-            while dest_path.exists():
-                dest_path = dest_path.parent / f"{stem}_{counter}{suffix}"
-                counter += 1
-        
-        # Extract file data
-        file_data = data[offset:offset + file_info.size]
-        offset += file_info.size
+        # Write and hash the file's data together, under a name not yet taken
+        end = offset + file_info.size
+        if end > len(view):
+            raise ValueError(f"Truncated data for {file_info.name}")
+        hasher = new_checksum()
+        f, dest_path = _create_unique(dest_path, next_suffix)
+        with f:
+            for start in range(offset, end, _HASH_BLOCK_SIZE):
+                block = view[start:min(start + _HASH_BLOCK_SIZE, end)]
+                hasher.update(block)
+                f.write(block)
+        offset = end
         
         # Verify checksum
-        actual_checksum = calculate_checksum_bytes(file_data)
-        if actual_checksum != file_info.checksum:
+        if hasher.hexdigest() != file_info.checksum:
+            dest_path.unlink()
             raise ValueError(f"Checksum mismatch for {file_info.name}")
         
-        # Write file
-        with open(dest_path, 'wb') as f:
-            f.write(file_data)
-        
         extracted_paths.append(dest_path)
     
     return extracted_paths
@@ -15,6 +15,13 @@ PORT = 9876
 BUFFER_SIZE = 65536  # 64KB chunks for file transfer
 MAX_FILE_SIZE = 100 * 1024 * 1024  # 100MB max per file
 MAX_TOTAL_SIZE = 500 * 1024 * 1024  # 500MB max total transfer
+PEER_CONNECTION_IDLE = 20.0  # Reuse a peer connection idle at most this long (peer drops them at 30s)
+FILE_REQUEST_WINDOW = 4  # Files requested ahead of the one being received in a transfer
+DOWNLOAD_CONNECTIONS = 2  # Idle connections kept per peer for on-demand downloads
+SERVER_WORKERS = 8  # Max connections handled concurrently; extra ones wait in a queue, idle ones on the selector
+SERVER_IDLE_TIMEOUT = 30.0  # Incoming connections idle this long are closed
+VERIFY_WORKERS = 4  # Threads verifying received chunks while the socket keeps reading (one more writes them in order)
+BULK_RECV_BUFFER = 0  # SO_RCVBUF floor for download sockets; 0 leaves the OS autotuning alone
 
 # Peer Discovery
 USE_AUTO_DISCOVERY = True  # Use mDNS/Bonjour to find peers
@@ -0,0 +1,978 @@
+"""
+Unit tests for the SyncAgent send paths (send_files / send_text).
+
+Like test_agent_ack.py, the agent is constructed directly with the pairing
+manager and transfer manager patched out and start() is never called.
+"""
+import hmac
+import os
+import socket
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from yank import agent as agent_module
+from yank import config
+from yank.agent import (
+    SyncAgent, _file_set_hash, _unix_socket_path, _unix_socket_dir, _connect_unix,
+    _read_handshake, _send_frames, _tune_socket,
+    _fresh_challenge, _auth_response, _size_bulk_socket, _bulk_recv_size, CHALLENGE_SIZE,
+)
+from yank.common.chunked_transfer import ChunkedFileWriter, create_file_metadata
+from yank.common.transfer_manager import TransferManager
+from yank.common.protocol import (
+    ChunkInfo,
+    MessageBuilder,
+    MessageParser,
+    MessageType,
+    MAX_MESSAGE_SIZE,
+    calculate_checksum_bytes,
+)
+
+
+def make_agent(pairing_manager=None, require_pairing=False, **kwargs) -> SyncAgent:
+    with patch("yank.agent.get_pairing_manager", return_value=pairing_manager or MagicMock()), \
+         patch("yank.agent.get_transfer_manager", return_value=MagicMock()):
+        agent = SyncAgent(require_pairing=require_pairing, **kwargs)
+    agent.set_peer("127.0.0.1", 1)
+    return agent
+
+
+def wait_for(predicate, timeout: float = 2.0) -> bool:
+    """Poll until predicate() is true; ACKs go out before receive callbacks run."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+@pytest.fixture
+def agent():
+    a = make_agent()
+    yield a
+    a._registry.stop()
+
+
+def no_key_pairing() -> MagicMock:
+    pairing = MagicMock()
+    pairing.get_encryption_key.return_value = None
+    return pairing
+
+
+class LoopbackPeers:
+    """
+    Server and client agents talking over a real loopback listener.
+
+    Calling it makes a pair and returns (server, client, port). Each accepted
+    connection is handled on its own thread by server._handle_client, or by
+    handle if given; the server-side sockets collect in accepted. close()
+    drops the client's connections, stops the listeners, joins every thread
+    and stops both registries.
+    """
+
+    def __init__(self):
+        self.accepted: list = []
+        self._listeners: list = []
+        self._threads: list = []
+        self._agents: list = []
+
+    def __call__(self, server_pairing=None, client_pairing=None, accepts: int = 1,
+                 handle=None, require_pairing: bool = False, **server_kwargs):
+        server_pairing = server_pairing or no_key_pairing()
+        server = make_agent(server_pairing, require_pairing=require_pairing, **server_kwargs)
+        client = make_agent(client_pairing or server_pairing, require_pairing=require_pairing)
+        self._agents += [server, client]
+        handle = handle or server._handle_client
+
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(accepts)
+        self._listeners.append(listener)
+        port = listener.getsockname()[1]
+        client.set_peer("127.0.0.1", port)
+
+        def serve():
+            for _ in range(accepts):
+                try:
+                    conn, addr = listener.accept()
+                except OSError:
+                    return
+                self.accepted.append(conn)
+                thread = threading.Thread(target=handle, args=(conn, addr), daemon=True)
+                self._threads.append(thread)
+                thread.start()
+
+        acceptor = threading.Thread(target=serve, daemon=True)
+        self._threads.append(acceptor)
+        acceptor.start()
+        return server, client, port
+
+    def close(self):
+        for a in self._agents:
+            a._close_download_connections()
+            with a._conn_lock:
+                a._drop_peer_connection()
+        for listener in self._listeners:
+            try:
+                listener.shutdown(socket.SHUT_RDWR)  # Wakes a blocked accept()
+            except OSError:
+                pass
+            listener.close()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        for a in self._agents:
+            a._registry.stop()
+
+
+@pytest.fixture
+def peers():
+    p = LoopbackPeers()
+    yield p
+    p.close()
+
+
+class TestFileSetHash:
+
+    def test_same_files_hash_equal(self, sample_file):
+        assert _file_set_hash([sample_file]) == _file_set_hash([sample_file])
+
+    def test_modified_file_changes_hash(self, sample_file):
+        before = _file_set_hash([sample_file])
+        sample_file.write_text("different contents, different size")
+        assert _file_set_hash([sample_file]) != before
+
+    def test_touched_file_changes_hash(self, sample_file):
+        before = _file_set_hash([sample_file])
+        st = sample_file.stat()
+        os.utime(sample_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert _file_set_hash([sample_file]) != before
+
+    def test_order_matters(self, temp_dir: Path):
+        a = temp_dir / "a.txt"
+        b = temp_dir / "b.txt"
+        a.write_text("a")
+        b.write_text("b")
+        assert _file_set_hash([a, b]) != _file_set_hash([b, a])
+
+
+class TestDuplicateSend:
+
+    def test_duplicate_files_skip_packing_and_network(self, agent, sample_file):
+        agent._last_sent_hash = _file_set_hash([sample_file])
+        agent._last_sent_time = time.time()
+
+        with patch("yank.agent.collect_files") as collect, patch("yank.agent.socket.socket") as sock:
+            assert agent.send_files([sample_file]) is True
+
+        collect.assert_not_called()
+        sock.assert_not_called()
+
+    def test_duplicate_text_skips_network(self, agent, sample_text):
+        agent._last_sent_text_hash = hash(sample_text)
+        agent._last_sent_text_time = time.time()
+
+        with patch("yank.agent.socket.socket") as sock:
+            assert agent.send_text(sample_text) is True
+
+        sock.assert_not_called()
+
+
+class TestFileRequestStreaming:
+    """FILE_REQUEST served over a real socket pair (sendfile path unless a key is given)."""
+
+    def _serve(self, agent, file_path: Path, offset: int = 0, chunk_size: int = 1024, key=None):
+        metadata = create_file_metadata([file_path], "tid-stream", chunk_size=chunk_size)
+        agent._registry.register_announced("tid-stream", metadata, [file_path])
+
+        server, client = socket.socketpair()
+        try:
+            frame = MessageBuilder.build_file_request("tid-stream", 0, offset)
+            parser = MessageParser()
+            parser.feed(frame)
+            msg_type, payload = parser.parse_one()
+            agent._handle_message(server, msg_type, payload, key)
+            server.shutdown(socket.SHUT_WR)
+
+            wire = b""
+            while True:
+                data = client.recv(65536)
+                if not data:
+                    break
+                wire += data
+        finally:
+            server.close()
+            client.close()
+
+        parser = MessageParser(key=key)
+        parser.feed(wire)
+        chunks = []
+        while True:
+            result = parser.parse_one()
+            if result is None:
+                break
+            assert result[0] == MessageType.FILE_CHUNK
+            chunks.append(MessageParser.parse_file_chunk(result[1]))
+        assert bytes(parser.buffer) == b""
+        return chunks
+
+    def test_chunks_reassemble_to_file(self, agent, temp_dir: Path):
+        content = os.urandom(5000)
+        file_path = temp_dir / "blob.bin"
+        file_path.write_bytes(content)
+
+        chunks = self._serve(agent, file_path)
+
+        assert [c.chunk_index for c, _ in chunks] == [0, 1, 2, 3, 4]
+        assert [c.is_last for c, _ in chunks] == [False, False, False, False, True]
+        assert b"".join(data for _, data in chunks) == content
+        for chunk_info, data in chunks:
+            assert chunk_info.size == len(data)
+            assert chunk_info.checksum == calculate_checksum_bytes(data)
+
+    def test_encrypted_chunks_reassemble_to_file(self, agent, temp_dir: Path, encryption_key):
+        content = os.urandom(5000)
+        file_path = temp_dir / "blob.bin"
+        file_path.write_bytes(content)
+
+        chunks = self._serve(agent, file_path, key=encryption_key)
+
+        assert b"".join(data for _, data in chunks) == content
+        for chunk_info, data in chunks:
+            assert chunk_info.checksum == calculate_checksum_bytes(data)
+
+    def test_resume_offset(self, agent, temp_dir: Path):
+        content = os.urandom(3000)
+        file_path = temp_dir / "blob.bin"
+        file_path.write_bytes(content)
+
+        chunks = self._serve(agent, file_path, offset=2048)
+
+        assert [(c.chunk_index, c.offset) for c, _ in chunks] == [(2, 2048)]
+        assert chunks[0][1] == content[2048:]
+
+    def test_short_sendfile_closes_connection_without_error_frame(self, agent, temp_dir: Path):
+        file_path = temp_dir / "blob.bin"
+        file_path.write_bytes(os.urandom(5000))
+        metadata = create_file_metadata([file_path], "tid-short", chunk_size=1024)
+        agent._registry.register_announced("tid-short", metadata, [file_path])
+
+        server, client = socket.socketpair()
+        conn = agent_module._ClientConnection(server, ("peer", 0), None)
+        conn.parser.feed(MessageBuilder.build_file_request("tid-short", 0))
+        try:
+            # The file "shrinks": sendfile comes up short after the chunk header went out
+            with patch.object(socket.socket, "sendfile", return_value=100), \
+                 patch.object(config, "SERVER_IDLE_TIMEOUT", 1.0):
+                agent._serve_client(conn)
+            assert server.fileno() == -1
+
+            wire = b""
+            while True:
+                data = client.recv(65536)
+                if not data:
+                    break
+                wire += data
+        finally:
+            server.close()
+            client.close()
+
+        # Only the first chunk's header: no TRANSFER_ERROR spliced into its data
+        assert b'"chunk_index": 0' in wire
+        assert b'"error"' not in wire
+        parser = MessageParser()
+        parser.feed(wire)
+        assert parser.parse_one() is None
+
+    def test_request_transfer_writes_verified_files(self, peers, temp_dir: Path):
+        src_dir = temp_dir / "src"
+        src_dir.mkdir()
+        # More files than config.FILE_REQUEST_WINDOW, so requests are pipelined
+        contents = [os.urandom(5000), os.urandom(1), os.urandom(3000)] + [os.urandom(700) for _ in range(5)]
+        paths = []
+        for i, content in enumerate(contents):
+            path = src_dir / f"f{i}.bin"
+            path.write_bytes(content)
+            paths.append(path)
+        metadata = create_file_metadata(paths, "tid-req", chunk_size=1024)
+
+        server, client, _ = peers()
+        client._transfer_manager = TransferManager(checkpoint_dir=temp_dir / "checkpoints")
+        server._registry.register_announced("tid-req", metadata, paths)
+        client._registry.register_pending("tid-req", metadata)
+
+        downloaded = client.request_transfer("tid-req", temp_dir / "dest")
+
+        assert [p.read_bytes() for p in downloaded] == contents
+
+    def test_request_transfer_failure_removes_partial_file(self, peers, temp_dir: Path):
+        file_path = temp_dir / "blob.bin"
+        file_path.write_bytes(os.urandom(5000))
+        metadata = create_file_metadata([file_path], "tid-fail", chunk_size=1024)
+
+        server, client, _ = peers()
+        client._transfer_manager = TransferManager(checkpoint_dir=temp_dir / "checkpoints")
+        server._registry.register_announced("tid-fail", metadata, [file_path])
+        client._registry.register_pending("tid-fail", metadata)
+
+        with patch.object(ChunkedFileWriter, "finalize", side_effect=OSError("disk full")):
+            assert client.request_transfer("tid-fail", temp_dir / "dest") is None
+
+        assert [p for p in (temp_dir / "dest").rglob("*") if p.is_file()] == []
+
+    def test_stop_shuts_down_chunk_pools(self, agent):
+        pools = (agent._verify_pool, agent._write_pool)
+        with patch("yank.agent.stop_discovery"):
+            agent.stop()
+        for pool in pools:
+            with pytest.raises(RuntimeError):
+                pool.submit(int)
+        assert (agent._verify_pool, agent._write_pool) != pools
+        assert agent._verify_pool.submit(int).result() == 0
+
+    def test_collect_chunk_writes_raises_on_mismatch(self, agent, temp_dir: Path):
+        writer = ChunkedFileWriter(temp_dir / "out.bin", 8, "unused")
+        pending = deque()
+        pending.append((0, agent._queue_chunk_write(writer, 0, b"abcd", calculate_checksum_bytes(b"abcd"))))
+        pending.append((4, agent._queue_chunk_write(writer, 4, b"efgh", "bad")))
+        try:
+            with pytest.raises(RuntimeError, match="offset 4"):
+                SyncAgent._collect_chunk_writes(pending)
+        finally:
+            writer.cleanup()
+
+    def test_chunks_are_written_in_queue_order(self, agent, temp_dir: Path):
+        chunks = [bytes([i]) * 1024 for i in range(6)]
+        writer = ChunkedFileWriter(temp_dir / "out.bin", 6 * 1024, "unused")
+        verify = ChunkedFileWriter.verify_chunk
+
+        def slow_first(offset, data, checksum):
+            if offset == 0:
+                time.sleep(0.1)  # Later chunks finish verifying first
+            return verify(offset, data, checksum)
+
+        pending = deque()
+        try:
+            with patch.object(ChunkedFileWriter, "verify_chunk", side_effect=slow_first), \
+                 patch.object(writer, "write_verified", wraps=writer.write_verified) as write:
+                for i, data in enumerate(chunks):
+                    pending.append((i * 1024, agent._queue_chunk_write(
+                        writer, i * 1024, data, calculate_checksum_bytes(data)
+                    )))
+                SyncAgent._collect_chunk_writes(pending)
+            assert [c.args[0] for c in write.call_args_list] == [i * 1024 for i in range(6)]
+        finally:
+            writer.cleanup()
+
+    def _download_setup(self, peers, temp_dir: Path, accepts: int = 1):
+        content = os.urandom(5000)
+        file_path = temp_dir / "blob.bin"
+        file_path.write_bytes(content)
+        metadata = create_file_metadata([file_path], "tid-dl", chunk_size=1024)
+
+        server, client, _ = peers(accepts=accepts)
+        server._registry.register_announced("tid-dl", metadata, [file_path])
+        client._registry.register_pending("tid-dl", metadata)
+        return content, client
+
+    def test_download_single_file_reuses_connection(self, peers, temp_dir: Path):
+        content, client = self._download_setup(peers, temp_dir)
+
+        assert client.download_single_file("tid-dl", 0) == content
+        # The server accepts once, so the second download must reuse the connection
+        assert client.download_single_file("tid-dl", 0) == content
+        assert len(peers.accepted) == 1
+
+    def test_download_single_file_rejects_corrupted_data(self, peers, temp_dir: Path):
+        content = os.urandom(2000)
+        file_path = temp_dir / "blob.bin"
+        file_path.write_bytes(content)
+        metadata = create_file_metadata([file_path], "tid-bad", chunk_size=4096)
+
+        def serve_corrupted(conn, addr):
+            with conn:
+                conn.recv(65536)
+                corrupted = bytes(len(content))
+                chunk_info = ChunkInfo(
+                    transfer_id="tid-bad", file_index=0, chunk_index=0, offset=0,
+                    size=len(corrupted), checksum=calculate_checksum_bytes(corrupted), is_last=True
+                )
+                conn.sendall(MessageBuilder.build_file_chunk(chunk_info, corrupted))
+                conn.recv(65536)
+
+        _, client, _ = peers(handle=serve_corrupted)
+        client._registry.register_pending("tid-bad", metadata)
+
+        assert client.download_single_file("tid-bad", 0) is None
+
+    def test_download_single_file_rejects_chunk_of_another_file(self, peers, temp_dir: Path):
+        content = os.urandom(2000)
+        file_path = temp_dir / "blob.bin"
+        file_path.write_bytes(content)
+        metadata = create_file_metadata([file_path], "tid-other", chunk_size=4096)
+
+        def serve_wrong_file(conn, addr):
+            with conn:
+                conn.recv(65536)
+                chunk_info = ChunkInfo(
+                    transfer_id="tid-other", file_index=1, chunk_index=0, offset=0,
+                    size=len(content), checksum=calculate_checksum_bytes(content), is_last=True
+                )
+                conn.sendall(MessageBuilder.build_file_chunk(chunk_info, content))
+                conn.recv(65536)
+
+        _, client, _ = peers(handle=serve_wrong_file)
+        client._registry.register_pending("tid-other", metadata)
+
+        assert client.download_single_file("tid-other", 0) is None
+
+    def test_download_single_file_replaces_closed_connection(self, peers, temp_dir: Path):
+        content, client = self._download_setup(peers, temp_dir, accepts=2)
+
+        assert client.download_single_file("tid-dl", 0) == content
+        peers.accepted[0].shutdown(socket.SHUT_RDWR)
+        # Whether the dead connection is spotted on checkout or on use, a
+        # fresh one takes over
+        assert client.download_single_file("tid-dl", 0) == content
+        assert len(peers.accepted) == 2
+
+
+class TestSendFrames:
+
+    def test_frames_arrive_in_order(self):
+        a, b = socket.socketpair()
+        try:
+            _send_frames(a, b"first", b"", bytearray(b"second"), b"x" * 100000)
+            a.shutdown(socket.SHUT_WR)
+            received = b""
+            while True:
+                data = b.recv(65536)
+                if not data:
+                    break
+                received += data
+        finally:
+            a.close()
+            b.close()
+        assert received == b"firstsecond" + b"x" * 100000
+
+    def test_more_frames_than_iov_max(self):
+        frames = [b"%05d" % i for i in range(3000)]
+        a, b = socket.socketpair()
+        try:
+            _send_frames(a, *frames)
+            a.shutdown(socket.SHUT_WR)
+            received = b""
+            while True:
+                data = b.recv(65536)
+                if not data:
+                    break
+                received += data
+        finally:
+            a.close()
+            b.close()
+        assert received == b"".join(frames)
+
+
+class TestReadHandshake:
+
+    def test_leaves_pipelined_bytes_on_socket(self):
+        ack = MessageBuilder.build_text_ack(True, "Text received")
+        a, b = socket.socketpair()
+        try:
+            a.sendall(MessageBuilder.build_auth_success() + ack)
+            assert _read_handshake(b) == (MessageType.AUTH_SUCCESS, b"")
+            assert b.recv(65536) == ack
+        finally:
+            a.close()
+            b.close()
+
+    def test_reads_payload(self):
+        challenge = os.urandom(32)
+        a, b = socket.socketpair()
+        try:
+            a.sendall(MessageBuilder.build_auth_challenge(challenge))
+            assert _read_handshake(b) == (MessageType.AUTH_CHALLENGE, challenge)
+        finally:
+            a.close()
+            b.close()
+
+    def test_rejects_oversized_frame(self):
+        a, b = socket.socketpair()
+        try:
+            a.sendall(MessageBuilder.build_text_transfer("x" * 5000))
+            assert _read_handshake(b) is None
+        finally:
+            a.close()
+            b.close()
+
+    def test_closed_connection(self):
+        a, b = socket.socketpair()
+        a.close()
+        try:
+            assert _read_handshake(b) is None
+        finally:
+            b.close()
+
+
+class TestTuneSocket:
+
+    def test_nodelay_and_keepalive(self):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(1)
+        sock = socket.create_connection(listener.getsockname())
+        try:
+            _tune_socket(sock)
+            assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+            assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+        finally:
+            sock.close()
+            listener.close()
+
+
+class TestSizeBulkSocket:
+
+    def test_disabled_by_default_keeps_os_size(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            before = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+            _size_bulk_socket(sock)
+            assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) == before
+        finally:
+            sock.close()
+
+    def test_raises_buffer_to_configured_floor(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            before = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+            with patch.object(config, "BULK_RECV_BUFFER", before * 4):
+                _size_bulk_socket(sock)
+            # Linux reports double the requested size; the OS may also clamp it
+            assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) > before
+        finally:
+            sock.close()
+
+
+class TestBulkRecvSize:
+
+    def test_reads_a_whole_chunk(self):
+        assert _bulk_recv_size(1024 * 1024) == 1024 * 1024
+
+    def test_never_below_buffer_size(self):
+        assert _bulk_recv_size(1024) == config.BUFFER_SIZE
+
+    def test_capped_at_max_message_size(self):
+        assert _bulk_recv_size(1 << 40) == MAX_MESSAGE_SIZE
+
+
+class TestFreshChallenge:
+
+    def test_challenges_are_distinct_across_refills(self):
+        # 300 challenges span more than two 4 KiB refills
+        challenges = [_fresh_challenge() for _ in range(300)]
+        assert all(isinstance(c, bytes) and len(c) == CHALLENGE_SIZE for c in challenges)
+        assert len(set(challenges)) == len(challenges)
+
+    def test_one_urandom_call_per_block(self):
+        with patch("yank.agent.os.urandom", wraps=os.urandom) as urandom:
+            for _ in range(4096 // CHALLENGE_SIZE + 1):
+                _fresh_challenge()
+        assert 1 <= urandom.call_count <= 2
+
+
+class TestAuthResponse:
+
+    def test_matches_one_shot_hmac(self):
+        key_a, key_b = os.urandom(32), os.urandom(32)
+        for key in (key_a, key_a, key_b, key_a):
+            challenge = _fresh_challenge()
+            assert _auth_response(challenge, key) == hmac.digest(key, challenge, "sha256")
+
+
+class TestPipelinedAuth:
+    """Paired send_text where the payload rides in the same write as AUTH_RESPONSE."""
+
+    def test_send_text_with_pairing(self, peers, encryption_key, sample_text):
+        pairing = MagicMock()
+        pairing.get_encryption_key.return_value = encryption_key
+        pairing.is_paired.return_value = True
+
+        received = []
+        server, client, _ = peers(pairing, require_pairing=True, on_text_received=received.append)
+
+        assert client.send_text(sample_text) is True
+        # Second send reuses the authenticated connection (the server accepts once)
+        assert client.send_text(sample_text + " again") is True
+        with client._conn_lock:
+            client._drop_peer_connection()
+        assert wait_for(lambda: not server._active_clients)
+
+        assert received == [sample_text, sample_text + " again"]
+
+    def test_wrong_key_is_rejected(self, peers, encryption_key, sample_text):
+        server_pairing = MagicMock()
+        server_pairing.get_encryption_key.return_value = encryption_key
+        server_pairing.is_paired.return_value = True
+        client_pairing = MagicMock()
+        client_pairing.get_encryption_key.return_value = bytes(len(encryption_key))
+        client_pairing.is_paired.return_value = True
+
+        received = []
+        server, client, _ = peers(server_pairing, client_pairing, require_pairing=True,
+                                  on_text_received=received.append)
+
+        assert client.send_text(sample_text) is False
+        assert wait_for(lambda: not server._active_clients)
+
+        assert received == []
+
+
+class TestPipelinedReplies:
+
+    def test_replies_to_pipelined_frames_are_corked_then_flushed(self, peers):
+        received = []
+        _, _, port = peers(on_text_received=received.append)
+
+        with patch("yank.agent._set_cork", wraps=agent_module._set_cork) as set_cork:
+            client = socket.create_connection(("127.0.0.1", port))
+            try:
+                client.sendall(b"".join(MessageBuilder.build_text_transfer(f"t{i}") for i in range(3)))
+                client.settimeout(5)
+                parser = MessageParser()
+                replies = []
+                while len(replies) < 3:
+                    data = client.recv(4096)
+                    if not data:
+                        break
+                    parser.feed(data)
+                    while (result := parser.parse_one()) is not None:
+                        replies.append(result[0])
+            finally:
+                client.close()
+
+        assert replies == [MessageType.TEXT_ACK] * 3
+        assert [c.args[1] for c in set_cork.call_args_list] == [True, False]
+        assert wait_for(lambda: received == ["t0", "t1", "t2"])
+
+
+class TestServerPool:
+
+    def test_connections_served_by_bounded_pool(self):
+        pairing = MagicMock()
+        pairing.get_encryption_key.return_value = None
+        received = []
+        server = make_agent(pairing, port=0, on_text_received=received.append)
+        client = make_agent(pairing)
+        with patch("yank.agent.config.SERVER_WORKERS", 2):
+            server._running = True
+            server._start_server()
+        try:
+            assert server._executor._max_workers == 2
+            client.set_peer("127.0.0.1", server._server_socket.getsockname()[1])
+            for i in range(5):
+                assert client.send_text(f"snippet {i}") is True
+        finally:
+            with patch("yank.agent.stop_discovery"):
+                client.stop()
+                server.stop()
+            server._registry.stop()
+            client._registry.stop()
+
+        assert server._executor is None
+        assert not server._server_thread.is_alive()
+        assert wait_for(lambda: len(received) == 5)
+        assert received == [f"snippet {i}" for i in range(5)]
+
+    def test_idle_connections_do_not_hold_workers(self):
+        pairing = MagicMock()
+        pairing.get_encryption_key.return_value = None
+        received = []
+        server = make_agent(pairing, port=0, on_text_received=received.append)
+        clients = [make_agent(pairing) for _ in range(3)]
+        with patch("yank.agent.config.SERVER_WORKERS", 1):
+            server._running = True
+            server._start_server()
+        try:
+            port = server._server_socket.getsockname()[1]
+            # Each client keeps its connection open after sending
+            for i, client in enumerate(clients):
+                client.set_peer("127.0.0.1", port)
+                assert client.send_text(f"from {i}") is True
+            assert clients[0].send_text("again") is True
+        finally:
+            with patch("yank.agent.stop_discovery"):
+                for client in clients:
+                    client.stop()
+                server.stop()
+            server._registry.stop()
+            for client in clients:
+                client._registry.stop()
+
+        assert wait_for(lambda: len(received) == 4)
+
+    def test_stop_unblocks_workers_on_active_connections(self):
+        pairing = MagicMock()
+        pairing.get_encryption_key.return_value = None
+        server = make_agent(pairing, port=0)
+        server._running = True
+        server._start_server()
+        sock = socket.create_connection(("127.0.0.1", server._server_socket.getsockname()[1]))
+        try:
+            # Half a frame: the worker blocks in recv waiting for the rest
+            sock.sendall(MessageBuilder.build_text_transfer("partial")[:6])
+            assert wait_for(lambda: len(server._active_clients) == 1)
+
+            started = time.time()
+            with patch("yank.agent.stop_discovery"):
+                server.stop()
+            sock.settimeout(2)
+            assert sock.recv(1) == b""
+            assert wait_for(lambda: not server._active_clients)
+            assert time.time() - started < 2
+        finally:
+            sock.close()
+            server._registry.stop()
+
+    def test_idle_connections_are_reaped(self):
+        pairing = MagicMock()
+        pairing.get_encryption_key.return_value = None
+        server = make_agent(pairing, port=0)
+        client = make_agent(pairing)
+        server._running = True
+        with patch("yank.agent.config.SERVER_IDLE_TIMEOUT", 0.2):
+            server._start_server()
+            try:
+                client.set_peer("127.0.0.1", server._server_socket.getsockname()[1])
+                assert client.send_text("hello") is True
+                peer_conn = client._peer_conn
+                # The server closes the connection, so the client sees EOF
+                peer_conn.settimeout(2)
+                assert peer_conn.recv(1) == b""
+            finally:
+                with patch("yank.agent.stop_discovery"):
+                    client.stop()
+                    server.stop()
+                server._registry.stop()
+                client._registry.stop()
+
+    def test_listener_gets_bulk_receive_buffer(self):
+        probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        default = probe.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        probe.close()
+
+        server = make_agent(port=0)
+        server._running = True
+        with patch.object(config, "BULK_RECV_BUFFER", default * 4):
+            server._start_server()
+        try:
+            assert server._server_socket.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) > default
+        finally:
+            with patch("yank.agent.stop_discovery"):
+                server.stop()
+            server._registry.stop()
+
+    def test_stop_wakes_accept_loop_immediately(self):
+        server = make_agent(port=0)
+        server._running = True
+        server._start_server()
+        try:
+            start = time.monotonic()
+            with patch("yank.agent.stop_discovery"):
+                server.stop()
+            assert time.monotonic() - start < 0.5
+            assert not server._server_thread.is_alive()
+        finally:
+            server._registry.stop()
+
+
+class TestPeerConnection:
+    """The cached client connection to the peer."""
+
+    @pytest.fixture
+    def pair(self):
+        pairing = MagicMock()
+        pairing.get_encryption_key.return_value = None
+        received = []
+        server = make_agent(pairing, port=0, on_text_received=received.append)
+        client = make_agent(pairing)
+
+        accepted = []
+        handle_client = server._handle_client
+
+        def tracking_handle_client(conn, addr):
+            accepted.append(conn)
+            handle_client(conn, addr)
+
+        server._handle_client = tracking_handle_client
+        server._running = True
+        server._start_server()
+        client.set_peer("127.0.0.1", server._server_socket.getsockname()[1])
+        yield client, accepted, received
+
+        with patch("yank.agent.stop_discovery"):
+            client.stop()
+            server.stop()
+        server._registry.stop()
+        client._registry.stop()
+
+    def test_connection_reused(self, pair):
+        client, accepted, received = pair
+        assert client.send_text("one") is True
+        assert client.send_text("two") is True
+        assert len(accepted) == 1
+        assert wait_for(lambda: len(received) == 2)
+        assert received == ["one", "two"]
+
+    def test_reconnects_after_peer_closes(self, pair):
+        client, accepted, received = pair
+        assert client.send_text("one") is True
+        accepted[0].shutdown(socket.SHUT_RDWR)
+        time.sleep(0.1)
+
+        assert client.send_text("two") is True
+        assert len(accepted) == 2
+        assert wait_for(lambda: len(received) == 2)
+        assert received == ["one", "two"]
+
+    def test_idle_connection_retired(self, pair):
+        client, accepted, received = pair
+        with patch("yank.agent.config.PEER_CONNECTION_IDLE", 0):
+            assert client.send_text("one") is True
+            time.sleep(0.01)
+            assert client.send_text("two") is True
+        assert len(accepted) == 2
+
+
+class TestSendFilesOverNetwork:
+
+    @pytest.fixture(params=[False, True], ids=["plain", "encrypted"])
+    def pair(self, request, monkeypatch, temp_dir: Path, encryption_key):
+        monkeypatch.setattr(config, "TEMP_DIR", temp_dir / "received")
+        pairing = MagicMock()
+        pairing.get_encryption_key.return_value = encryption_key if request.param else None
+        received = []
+        server = make_agent(pairing, port=0, on_files_received=received.extend)
+        client = make_agent(pairing)
+        server._running = True
+        server._start_server()
+        client.set_peer("127.0.0.1", server._server_socket.getsockname()[1])
+        yield client, received
+
+        with patch("yank.agent.stop_discovery"):
+            client.stop()
+            server.stop()
+        server._registry.stop()
+        client._registry.stop()
+
+    def test_files_arrive_intact(self, pair, temp_dir: Path):
+        client, received = pair
+        src = temp_dir / "src"
+        (src / "dir").mkdir(parents=True)
+        contents = {
+            "a.bin": os.urandom(200000),
+            "empty.txt": b"",
+        }
+        for name, data in contents.items():
+            (src / name).write_bytes(data)
+        (src / "dir" / "nested.txt").write_bytes(b"nested")
+
+        assert client.send_files([src / "a.bin", src / "empty.txt", src / "dir"]) is True
+        assert wait_for(lambda: len(received) == 3)
+
+        by_name = {p.name: p.read_bytes() for p in received}
+        assert by_name == {"a.bin": contents["a.bin"], "empty.txt": b"", "nested.txt": b"nested"}
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="AF_UNIX not available")
+class TestUnixSocketFastPath:
+
+    @pytest.fixture(autouse=True)
+    def runtime_dir(self, temp_dir, monkeypatch):
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(temp_dir))
+        return temp_dir
+
+    def _listen(self):
+        server = make_agent(port=0)
+        server._running = True
+        server._start_server()
+        return server, server._server_socket.getsockname()[1]
+
+    def _stop(self, server):
+        with patch("yank.agent.stop_discovery"):
+            server.stop()
+        server._registry.stop()
+
+    def test_socket_dir_is_private(self, runtime_dir):
+        (runtime_dir / "yank").mkdir(mode=0o755)
+        os.chmod(runtime_dir / "yank", 0o755)
+
+        assert _unix_socket_dir() == runtime_dir / "yank"
+        assert (runtime_dir / "yank").stat().st_mode & 0o777 == 0o700
+
+    def test_foreign_socket_dir_is_refused(self, runtime_dir):
+        (runtime_dir / "yank").mkdir()
+        with patch("yank.agent.os.getuid", return_value=os.getuid() + 1):
+            assert _unix_socket_dir() is None
+            assert _unix_socket_path(1234) is None
+
+    def test_connect_refuses_listener_of_another_user(self):
+        server, port = self._listen()
+        try:
+            assert _unix_socket_path(port).exists()
+            with patch("yank.agent._peer_uid", return_value=os.getuid() + 1):
+                assert _connect_unix(port) is None
+            sock = _connect_unix(port)
+            assert sock is not None
+            sock.close()
+        finally:
+            self._stop(server)
+
+    def test_connect_refuses_non_socket(self):
+        _unix_socket_path(4321).write_text("not a socket")
+        assert _connect_unix(4321) is None
+
+    def test_loopback_peer_uses_unix_socket(self):
+        pairing = MagicMock()
+        pairing.get_encryption_key.return_value = None
+        received = []
+        server = make_agent(pairing, port=0, on_text_received=received.append)
+        client = make_agent(pairing)
+        server._running = True
+        server._start_server()
+        port = server._server_socket.getsockname()[1]
+        path = _unix_socket_path(port)
+        try:
+            assert path.exists()
+            assert path.stat().st_mode & 0o777 == 0o600
+
+            client.set_peer("127.0.0.1", port)
+            assert client.send_text("over unix") is True
+            assert client._peer_conn.family == socket.AF_UNIX
+            assert wait_for(lambda: received == ["over unix"])
+        finally:
+            with patch("yank.agent.stop_discovery"):
+                client.stop()
+                server.stop()
+            server._registry.stop()
+            client._registry.stop()
+
+        assert not path.exists()
+
+    def test_falls_back_to_tcp_without_unix_listener(self, agent):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(1)
+        port = listener.getsockname()[1]
+        try:
+            assert not _unix_socket_path(port).exists()
+            conn = agent._open_peer_connection("127.0.0.1", port, None, b"")
+            assert conn is not None
+            assert conn[0].family == socket.AF_INET
+            conn[0].close()
+        finally:
+            listener.close()
@@ -0,0 +1,193 @@
+"""
+Unit tests for chunked_transfer.py - chunked reads, the chunk buffer pool, checksum cache, writer and progress throttle
+"""
+import hashlib
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from yank.common.chunked_transfer import (
+    ChunkBufferPool, ChunkChecksumCache, ChunkedFileReader, ChunkedFileWriter, ProgressThrottle,
+)
+from yank.common.protocol import calculate_checksum_bytes
+
+
+class TestChunkBufferPool:
+    """Tests for ChunkBufferPool"""
+
+    def test_released_buffer_is_reused(self):
+        pool = ChunkBufferPool(1024, count=2)
+        buf = pool.acquire()
+        pool.release(buf)
+        assert pool.acquire() is buf
+
+    def test_pool_is_bounded(self):
+        pool = ChunkBufferPool(1024, count=1)
+        a, b = pool.acquire(), pool.acquire()
+        pool.release(a)
+        pool.release(b)
+        assert pool.acquire() is a
+        assert pool.acquire() is not b
+
+    def test_oversized_request_not_pooled(self):
+        pool = ChunkBufferPool(1024, count=2)
+        big = pool.acquire(4096)
+        assert len(big) == 4096
+        pool.release(big)
+        assert len(pool.acquire()) == 1024
+
+
+class TestChunkedFileReader:
+    """Tests for ChunkedFileReader"""
+
+    def test_read_chunks_with_pool(self, temp_dir: Path):
+        content = os.urandom(2500)
+        path = temp_dir / "data.bin"
+        path.write_bytes(content)
+        pool = ChunkBufferPool(1024, count=1)
+
+        reader = ChunkedFileReader(path, chunk_size=1024, pool=pool)
+        chunks = [(index, offset, bytes(data), checksum, is_last)
+                  for index, offset, data, checksum, is_last in reader.read_chunks()]
+
+        assert [c[:2] for c in chunks] == [(0, 0), (1, 1024), (2, 2048)]
+        assert b"".join(c[2] for c in chunks) == content
+        assert all(c[3] == hashlib.sha256(c[2]).hexdigest() for c in chunks)
+        assert [c[4] for c in chunks] == [False, False, True]
+
+        # The buffer went back to the pool and is used for the next read
+        buf = pool.acquire()
+        pool.release(buf)
+        assert list(reader.read_chunk_ranges(2048))[0][2] == 452
+        assert pool.acquire() is buf
+
+    def test_resume_offset(self, temp_dir: Path):
+        content = os.urandom(3000)
+        path = temp_dir / "data.bin"
+        path.write_bytes(content)
+
+        reader = ChunkedFileReader(path, chunk_size=1024)
+        chunks = list(reader.read_chunks(2048))
+
+        assert len(chunks) == 1
+        assert chunks[0][1] == 2048
+        assert bytes(chunks[0][2]) == content[2048:]
+
+
+class TestChunkChecksumCache:
+    """Tests for ChunkChecksumCache with ChunkedFileReader.read_chunk_ranges"""
+
+    def _ranges(self, path: Path, cache: ChunkChecksumCache, offset: int = 0):
+        return list(ChunkedFileReader(path, chunk_size=1024, checksum_cache=cache).read_chunk_ranges(offset))
+
+    def test_second_pass_does_not_read_file(self, temp_dir: Path):
+        path = temp_dir / "data.bin"
+        path.write_bytes(os.urandom(2500))
+        cache = ChunkChecksumCache()
+
+        first = self._ranges(path, cache)
+        with patch("builtins.open", side_effect=AssertionError("file was read")):
+            assert self._ranges(path, cache) == first
+            assert self._ranges(path, cache, 1024) == first[1:]
+
+    def test_modified_file_is_rehashed(self, temp_dir: Path):
+        path = temp_dir / "data.bin"
+        path.write_bytes(os.urandom(2500))
+        cache = ChunkChecksumCache()
+        self._ranges(path, cache)
+
+        content = os.urandom(3000)
+        path.write_bytes(content)
+        os.utime(path, ns=(1, 1))
+
+        ranges = self._ranges(path, cache)
+        assert [r[3] for r in ranges] == [
+            hashlib.sha256(content[i:i + 1024]).hexdigest() for i in range(0, 3000, 1024)
+        ]
+
+    def test_partial_pass_is_not_cached(self, temp_dir: Path):
+        path = temp_dir / "data.bin"
+        path.write_bytes(os.urandom(2500))
+        cache = ChunkChecksumCache()
+
+        self._ranges(path, cache, 1024)
+        next(iter(ChunkedFileReader(path, chunk_size=1024, checksum_cache=cache).read_chunk_ranges()))
+        assert cache.get(path, 1024) is None
+
+    def test_least_recently_used_file_is_evicted(self, temp_dir: Path):
+        cache = ChunkChecksumCache(max_files=1)
+        a, b = temp_dir / "a.bin", temp_dir / "b.bin"
+        a.write_bytes(b"a")
+        b.write_bytes(b"b")
+        self._ranges(a, cache)
+        self._ranges(b, cache)
+        assert cache.get(a, 1024) is None
+        assert cache.get(b, 1024) is not None
+
+
+class TestChunkedFileWriter:
+    """Tests for ChunkedFileWriter"""
+
+    def test_file_is_preallocated(self, temp_dir: Path):
+        writer = ChunkedFileWriter(temp_dir / "out.bin", 4096, "unused")
+        try:
+            data = b"x" * 1024
+            assert writer.write_chunk(0, data, calculate_checksum_bytes(data))
+            writer._file.flush()
+            assert writer.temp_path.stat().st_size == 4096
+        finally:
+            writer.cleanup()
+
+    def test_finalize_after_out_of_order_chunks(self, temp_dir: Path):
+        content = os.urandom(2500)
+        writer = ChunkedFileWriter(temp_dir / "out.bin", len(content), calculate_checksum_bytes(content))
+        for offset in (2048, 0, 1024):
+            data = content[offset:offset + 1024]
+            assert writer.write_chunk(offset, data, calculate_checksum_bytes(data))
+        assert writer.finalize().read_bytes() == content
+
+    def test_contiguous_chunks_are_buffered(self, temp_dir: Path):
+        content = os.urandom(4096)
+        writer = ChunkedFileWriter(temp_dir / "out.bin", len(content), calculate_checksum_bytes(content))
+        for offset in (0, 1024):
+            data = content[offset:offset + 1024]
+            assert writer.write_chunk(offset, data, calculate_checksum_bytes(data))
+        # Nothing has reached the file yet
+        assert writer.temp_path.read_bytes() == bytes(len(content))
+
+        for offset in (3072, 2048):
+            data = content[offset:offset + 1024]
+            assert writer.write_chunk(offset, data, calculate_checksum_bytes(data))
+        assert writer.finalize().read_bytes() == content
+
+    def test_missing_tail_is_a_size_mismatch(self, temp_dir: Path):
+        content = os.urandom(2500)
+        writer = ChunkedFileWriter(temp_dir / "out.bin", len(content), calculate_checksum_bytes(content))
+        data = content[:1024]
+        writer.write_chunk(0, data, calculate_checksum_bytes(data))
+        with pytest.raises(ValueError, match="Size mismatch"):
+            writer.finalize()
+        assert not writer.temp_path.exists()
+
+
+class TestProgressThrottle:
+    """Tests for ProgressThrottle"""
+
+    def test_rate_limited_by_time_and_bytes(self):
+        throttle = ProgressThrottle(interval=3600, min_bytes=1000)
+        assert throttle.should_report(10)
+        assert not throttle.should_report(500)
+        assert throttle.should_report(1010)
+        assert not throttle.should_report(1500)
+
+    def test_final_always_reported(self):
+        throttle = ProgressThrottle(interval=3600, min_bytes=1000)
+        assert throttle.should_report(10)
+        assert throttle.should_report(20, final=True)
+
+    def test_interval_elapsed(self):
+        throttle = ProgressThrottle(interval=0, min_bytes=1 << 30)
+        assert throttle.should_report(1)
+        assert throttle.should_report(2)
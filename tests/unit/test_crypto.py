@@ -3,8 +3,12 @@ Unit tests for crypto.py - Encryption and decryption
 """
 import pytest
 import os
+from unittest.mock import patch
 
-from yank.common.crypto import encrypt, decrypt, generate_key, derive_key
+from yank.common.crypto import (
+    encrypt, encrypt_parts, decrypt, generate_key, derive_key, _cipher, _next_nonce, _reset_nonces,
+    backend_info, HAS_CRYPTOGRAPHY
+)
 
 
 class TestEncryptDecrypt:
@@ -68,6 +72,38 @@ class TestEncryptDecrypt:
         assert decrypt(ciphertext1, encryption_key) == plaintext
         assert decrypt(ciphertext2, encryption_key) == plaintext
 
+    def test_cipher_reused_per_key(self, encryption_key):
+        assert _cipher(encryption_key) is _cipher(encryption_key)
+        assert _cipher(encryption_key) is not _cipher(generate_key())
+
+    def test_encrypt_parts_matches_encrypt_layout(self, encryption_key):
+        nonce, ciphertext = encrypt_parts(memoryview(b"xxdata")[2:], encryption_key)
+        assert len(nonce) == 12
+        assert decrypt(nonce + ciphertext, encryption_key) == b"data"
+        assert decrypt(bytearray(nonce + ciphertext), encryption_key) == b"data"
+
+    def test_nonces_are_unique_across_batches(self):
+        nonces = [_next_nonce() for _ in range(2000)]
+        assert all(len(n) == 12 for n in nonces)
+        assert len(set(nonces)) == len(nonces)
+
+    def test_reset_discards_batched_nonces(self):
+        _next_nonce()
+        with patch("yank.common.crypto.os.urandom", wraps=os.urandom) as urandom:
+            _reset_nonces()
+            _next_nonce()
+        urandom.assert_called_once()
+
+    def test_bytearray_key(self, encryption_key):
+        ciphertext = encrypt(b"data", bytearray(encryption_key))
+        assert decrypt(ciphertext, encryption_key) == b"data"
+
+    @pytest.mark.skipif(not HAS_CRYPTOGRAPHY, reason="cryptography not installed")
+    def test_backend_info_reports_versions(self):
+        info = backend_info()
+        assert info.startswith("cryptography ")
+        assert "failed" not in info
+
 
 class TestKeyGeneration:
     """Tests for key generation functions"""
@@ -0,0 +1,121 @@
+"""
+Unit tests for file_registry.py - Transfer tracking
+"""
+import pytest
+import threading
+import time
+
+from yank.common.file_registry import FileRegistry, TransferStatus
+from yank.common.protocol import TransferMetadata, FileInfo
+from yank.common.chunked_transfer import create_file_metadata
+
+
+def make_metadata(transfer_id: str, expires_at: float = 0.0) -> TransferMetadata:
+    return TransferMetadata(
+        files=[FileInfo(name="a.txt", size=3, checksum="x", relative_path="a.txt", file_index=0)],
+        total_size=3,
+        timestamp=time.time(),
+        source_os="macos",
+        transfer_id=transfer_id,
+        expires_at=expires_at,
+    )
+
+
+@pytest.fixture
+def registry():
+    r = FileRegistry(cleanup_interval=3600)
+    yield r
+    r.stop()
+
+
+def lock_is_free(registry: FileRegistry) -> bool:
+    """Whether another thread can use the registry right now"""
+    done = threading.Event()
+    thread = threading.Thread(target=lambda: (registry.get_transfer("x"), done.set()))
+    thread.start()
+    thread.join(timeout=1)
+    return done.is_set()
+
+
+class TestCallbacks:
+    """Callbacks run without the registry lock held"""
+
+    def test_expired_callback_runs_outside_lock(self, registry):
+        seen = []
+        registry.register_callback('on_expired', lambda info: seen.append((info.transfer_id, lock_is_free(registry))))
+        registry.register_pending("old", make_metadata("old", expires_at=time.time() - 1))
+        registry.register_pending("new", make_metadata("new", expires_at=time.time() + 60))
+
+        assert registry.cleanup_expired() == 1
+        assert seen == [("old", True)]
+        assert registry.get_transfer("old").status == TransferStatus.EXPIRED
+        assert registry.get_transfer("new").status == TransferStatus.PENDING
+
+    def test_complete_callback_runs_outside_lock(self, registry):
+        seen = []
+        registry.register_callback('on_transfer_complete', lambda info: seen.append(lock_is_free(registry)))
+        registry.register_pending("tid", make_metadata("tid"))
+
+        info = registry.complete_transfer("tid")
+        assert info.status == TransferStatus.COMPLETED
+        assert seen == [True]
+        assert registry.complete_transfer("missing") is None
+
+
+class TestCleanupThread:
+    """Background expiry cleanup"""
+
+    def test_cleanup_runs_periodically_until_stopped(self):
+        registry = FileRegistry(cleanup_interval=0.02)
+        try:
+            registry.register_pending("old", make_metadata("old", expires_at=time.time() - 1))
+            deadline = time.time() + 2
+            while registry.get_transfer("old").status != TransferStatus.EXPIRED and time.time() < deadline:
+                time.sleep(0.01)
+            assert registry.get_transfer("old").status == TransferStatus.EXPIRED
+        finally:
+            registry.stop()
+        assert not registry._cleanup_thread.is_alive()
+
+
+class TestProgress:
+    """update_transfer_progress"""
+
+    def test_progress_marks_transferring(self, registry):
+        registry.register_pending("tid", make_metadata("tid"))
+        registry.update_transfer_progress("tid", 2, file_index=0, chunk_index=1)
+
+        info = registry.get_transfer("tid")
+        assert info.status == TransferStatus.TRANSFERRING
+        assert (info.bytes_transferred, info.current_file_index, info.current_chunk_index) == (2, 0, 1)
+        registry.update_transfer_progress("missing", 1)
+
+    def test_progress_keeps_cancelled_status(self, registry):
+        registry.register_pending("tid", make_metadata("tid"))
+        registry.cancel_transfer("tid", "user")
+        registry.update_transfer_progress("tid", 3)
+
+        info = registry.get_transfer("tid")
+        assert info.status == TransferStatus.CANCELLED
+        assert info.bytes_transferred == 3
+
+
+class TestRegisterAnnounced:
+    """Sender-side file_index -> source path mapping"""
+
+    def test_directories_and_files_map_to_their_indexes(self, registry, temp_dir):
+        (temp_dir / "docs" / "sub").mkdir(parents=True)
+        (temp_dir / "docs" / "a.txt").write_text("a")
+        (temp_dir / "docs" / "sub" / "b.txt").write_text("b")
+        (temp_dir / "first.txt").write_text("first")
+        (temp_dir / "last.txt").write_text("last")
+        paths = [temp_dir / "first.txt", temp_dir / "docs", temp_dir / "last.txt"]
+
+        metadata = create_file_metadata(paths, "tid")
+        info = registry.register_announced("tid", metadata, paths)
+
+        assert len(info.source_paths) == len(metadata.files) == 4
+        for file_info in metadata.files:
+            source = registry.get_file_for_transfer("tid", file_info.file_index)
+            assert source.name == file_info.name
+            assert source.read_text() == source.stem
@@ -6,10 +6,12 @@ import json
 import struct
 import hashlib
 from pathlib import Path
+from unittest.mock import patch
 
 from yank.common.protocol import (
     MessageType, MessageBuilder, MessageParser, TransferMetadata, FileInfo,
-    MessageFlags, MAX_MESSAGE_SIZE, MAX_BUFFER_SIZE, _safe_json_parse
+    MessageFlags, MAX_MESSAGE_SIZE, MAX_BUFFER_SIZE, _safe_json_parse,
+    collect_files, pack_files, unpack_files, calculate_checksum
 )
 
 
@@ -76,6 +78,94 @@ class TestMessageBuilder:
         assert msg is not None
         assert msg[4] == MessageType.PONG
 
+    def test_file_transfer_header_plus_data_matches_full_message(self, sample_file):
+        metadata, file_data = pack_files([sample_file])
+        header = MessageBuilder.build_file_transfer_header(metadata)
+
+        assert header + file_data == MessageBuilder.build_file_transfer(metadata, file_data)
+
+    def test_file_chunk_ack_roundtrip(self, encryption_key):
+        for chunk_index in (0, 7, 123456):
+            msg = MessageBuilder.build_file_chunk_ack('tid "1"', 2, chunk_index)
+            assert struct.unpack('>I', msg[:4])[0] == len(msg) - 4
+            assert MessageParser.parse_file_chunk_ack(msg[5:]) == {
+                'transfer_id': 'tid "1"', 'file_index': 2, 'chunk_index': chunk_index
+            }
+
+        parser = MessageParser(key=encryption_key)
+        parser.feed(MessageBuilder.build_file_chunk_ack("tid", 0, 9, key=encryption_key))
+        msg_type, payload = parser.parse_one()
+        assert msg_type == MessageType.FILE_CHUNK_ACK
+        assert MessageParser.parse_file_chunk_ack(payload)['chunk_index'] == 9
+
+    def test_collect_files_matches_pack_files(self, temp_dir):
+        (temp_dir / "sub").mkdir()
+        (temp_dir / "sub" / "one.txt").write_text("one")
+        (temp_dir / "two.txt").write_text("two")
+
+        metadata, sources = collect_files([temp_dir / "sub", temp_dir / "two.txt"])
+        packed_metadata, packed = pack_files([temp_dir / "sub", temp_dir / "two.txt"])
+
+        assert [f.relative_path for f in metadata.files] == [f.relative_path for f in packed_metadata.files]
+        assert [f.checksum for f in metadata.files] == [f.checksum for f in packed_metadata.files]
+        assert packed_metadata.total_size == metadata.total_size == len(packed)
+        assert sources == [temp_dir / "sub" / "one.txt", temp_dir / "two.txt"]
+        assert b"".join(p.read_bytes() for p in sources) == packed
+
+
+    def test_parallel_hashing_keeps_file_order(self, temp_dir):
+        for i in range(12):
+            (temp_dir / f"f{i:02d}.txt").write_text(f"file {i}" * (i + 1))
+        paths = sorted(temp_dir.iterdir())
+
+        metadata, sources = collect_files(paths)
+        with patch("yank.common.protocol._HASH_WORKERS", 1):
+            serial, _ = collect_files(paths)
+        packed_metadata, packed = pack_files(paths)
+
+        assert sources == paths
+        assert [f.checksum for f in metadata.files] == [calculate_checksum(p) for p in paths]
+        assert [f.checksum for f in serial.files] == [f.checksum for f in metadata.files]
+        assert [f.checksum for f in packed_metadata.files] == [f.checksum for f in metadata.files]
+        assert packed == b"".join(p.read_bytes() for p in paths)
+
+    def test_unpack_files_round_trip(self, temp_dir):
+        (temp_dir / "sub").mkdir()
+        (temp_dir / "sub" / "one.txt").write_text("one")
+        (temp_dir / "big.bin").write_bytes(bytes(range(256)) * 9000)
+
+        metadata, packed = pack_files([temp_dir / "sub", temp_dir / "big.bin"])
+        paths = unpack_files(metadata, memoryview(packed), temp_dir / "out")
+
+        assert [p.relative_to(temp_dir / "out").as_posix() for p in paths] == ["sub/one.txt", "big.bin"]
+        assert paths[0].read_text() == "one"
+        assert paths[1].read_bytes() == (temp_dir / "big.bin").read_bytes()
+
+    def test_unpack_files_renames_collisions(self, temp_dir):
+        for name in "abc":
+            (temp_dir / name).mkdir()
+            (temp_dir / name / "same.txt").write_text(name)
+        metadata, packed = pack_files([temp_dir / n / "same.txt" for n in "abc"])
+        (temp_dir / "out").mkdir()
+        (temp_dir / "out" / "same_1.txt").write_text("existing")
+
+        paths = unpack_files(metadata, packed, temp_dir / "out")
+
+        assert [p.name for p in paths] == ["same.txt", "same_2.txt", "same_3.txt"]
+        assert [p.read_text() for p in paths] == ["a", "b", "c"]
+        assert (temp_dir / "out" / "same_1.txt").read_text() == "existing"
+
+    def test_unpack_files_removes_corrupted_file(self, temp_dir):
+        (temp_dir / "a.txt").write_text("hello")
+        metadata, packed = pack_files([temp_dir / "a.txt"])
+
+        with pytest.raises(ValueError, match="Checksum mismatch"):
+            unpack_files(metadata, b"HELLO", temp_dir / "out")
+        assert list((temp_dir / "out").iterdir()) == []
+
+        with pytest.raises(ValueError, match="Truncated"):
+            unpack_files(metadata, packed[:3], temp_dir / "out")
+
 
 class TestMessageParser:
     """Tests for MessageParser"""
@@ -119,6 +209,49 @@ class TestMessageParser:
         result = parser.parse_one()
         assert result is not None
 
+    def test_feed_reused_memoryview(self, sample_text):
+        parser = MessageParser()
+        msg = MessageBuilder.build_text_transfer(sample_text, key=None)
+        recv_buf = bytearray(len(msg) + 16)
+        view = memoryview(recv_buf)
+
+        recv_buf[:len(msg)] = msg
+        parser.feed(view[:len(msg)])
+        # Overwriting the receive buffer must not affect what was fed
+        recv_buf[:] = bytes(len(recv_buf))
+
+        msg_type, payload = parser.parse_one()
+        assert msg_type == MessageType.TEXT_TRANSFER
+        assert MessageParser.parse_text_transfer(payload) == sample_text
+
+    def test_many_frames_with_partial_feeds(self):
+        parser = MessageParser()
+        texts = [f"message {i}" for i in range(200)]
+        stream = b"".join(MessageBuilder.build_text_transfer(t, key=None) for t in texts)
+
+        received = []
+        for i in range(0, len(stream), 7):
+            assert parser.feed(stream[i:i + 7])
+            while True:
+                result = parser.parse_one()
+                if result is None:
+                    break
+                received.append(MessageParser.parse_text_transfer(result[1]))
+
+        assert received == texts
+        assert parser.buffered == 0
+        assert parser.buffer == b""
+
+    def test_buffer_holds_only_unparsed_bytes(self):
+        parser = MessageParser()
+        msg = MessageBuilder.build_text_transfer("hello", key=None)
+        parser.feed(msg + msg[:3])
+
+        assert parser.parse_one() is not None
+        assert parser.parse_one() is None
+        assert parser.buffered == 3
+        assert parser.buffer == msg[:3]
+
     def test_buffer_overflow_protection(self):
         parser = MessageParser()
 
@@ -170,6 +303,25 @@ class TestMessageParser:
         assert parsed_text == sample_text
 
 
+class TestCalculateChecksum:
+    """Tests for calculate_checksum"""
+
+    def test_matches_sha256_of_contents(self, large_sample_file):
+        expected = hashlib.sha256(large_sample_file.read_bytes()).hexdigest()
+        assert calculate_checksum(large_sample_file) == expected
+
+    def test_fallback_without_file_digest(self, large_sample_file):
+        expected = hashlib.sha256(large_sample_file.read_bytes()).hexdigest()
+        with patch("yank.common.protocol.hashlib", wraps=hashlib) as mock_hashlib:
+            del mock_hashlib.file_digest
+            assert calculate_checksum(large_sample_file) == expected
+
+    def test_empty_file(self, temp_dir):
+        empty = temp_dir / "empty"
+        empty.write_bytes(b"")
+        assert calculate_checksum(empty) == hashlib.sha256(b"").hexdigest()
+
+
 class TestProtocolConstants:
     """Test protocol constants and limits"""
 